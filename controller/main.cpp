@@ -10,6 +10,9 @@
 #include <cmath>
 #include <thread>
 #include <chrono>
+#ifdef __linux__
+#include <sys/prctl.h>
+#endif
 
 #define UPPER_THRESHOLD 32000
 #define LOWER_THRESHOLD 200
@@ -53,6 +56,17 @@ int main() {
     signal(SIGINT,  signal_handler);
     signal(SIGTERM, signal_handler);
 
+#ifdef __linux__
+    // Get SIGTERM from the kernel if the orchestrator dies, so a crashed
+    // main.py never leaves this process holding the controller. Set here
+    // rather than in a Python preexec_fn, which would force a full fork.
+    const pid_t parent = getppid();
+    prctl(PR_SET_PDEATHSIG, SIGTERM);
+    if (getppid() != parent) {
+        return 0;  // parent exited before the death signal was armed
+    }
+#endif
+
     SDL_Event e;
 
     if (SDL_Init(SDL_INIT_GAMECONTROLLER | SDL_INIT_SENSOR) < 0) {
@@ -5,26 +5,211 @@ MediaPipe-based gesture detection for rehabilitation gaming.
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import Optional, List, Tuple
+from types import MappingProxyType
+from typing import Optional, List, Tuple, Mapping, FrozenSet
+import threading
 import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Gestures that read face mesh landmarks and therefore need the Holistic graph.
+# Everything else is served by the much cheaper Pose-only graph.
+FACE_GESTURES = frozenset({'mouth_open'})
+
+# MediaPipe Pose always reports this many body landmarks
+NUM_POSE_LANDMARKS = 33
+
+# Pose landmark indices used by the gesture checks, resolved once at import
+LEFT_SHOULDER = mp.solutions.pose.PoseLandmark.LEFT_SHOULDER.value
+RIGHT_SHOULDER = mp.solutions.pose.PoseLandmark.RIGHT_SHOULDER.value
+LEFT_ELBOW = mp.solutions.pose.PoseLandmark.LEFT_ELBOW.value
+RIGHT_ELBOW = mp.solutions.pose.PoseLandmark.RIGHT_ELBOW.value
+LEFT_WRIST = mp.solutions.pose.PoseLandmark.LEFT_WRIST.value
+RIGHT_WRIST = mp.solutions.pose.PoseLandmark.RIGHT_WRIST.value
+
+# Camera output. Pose resizes its input to 256x256 internally, so 640x480 is
+# already generous; (320, 240) quarters capture, copy and overlay cost.
+DEFAULT_FRAME_SIZE = (640, 480)
+CAPTURE_FPS = 30
+
+# MediaPipe's default; see GestureDetector.__init__
+DEFAULT_MIN_TRACKING_CONFIDENCE = 0.5
+
+# Frame-diff gate: frames are compared as tiny thumbnails against the last
+# frame that actually went through inference
+MOTION_THUMB_SIZE = (32, 24)
+
+# Frame buffers the capture thread cycles through: one waiting for inference,
+# one being processed, one shown on the dashboard, plus two spares so a buffer
+# isn't rewritten the moment it is released
+FRAME_POOL_SIZE = 5
+
+# Dashboard overlay: skeleton edges as (start, end) landmark index pairs, and
+# the visibility below which MediaPipe's own drawing utils hide a landmark
+_POSE_EDGES = np.array(sorted(mp.solutions.pose.POSE_CONNECTIONS), dtype=np.intp)
+_VISIBILITY_THRESHOLD = 0.5
+
+
+# ----------------------------------------------------------------------
+# Gesture checks
+#
+# Pure functions over (33, 3) landmark arrays (x, y, z per row) and plain
+# float thresholds: no detector state, logging or protobuf access, so they
+# stay cheap per frame and can be tested or compiled in isolation.
+# Image Y grows downward, so "higher" means a smaller Y value.
+# ----------------------------------------------------------------------
+
+def _elbow_raised(curr: np.ndarray, prev: Optional[np.ndarray], elbow_id: int,
+                  shoulder_id: int, raise_min: float, delta_thr: float) -> bool:
+    """
+    Elbow is held above the shoulder, or is above it and moving up fast enough.
+
+    Args:
+        curr: Current landmark array
+        prev: Previous frame's landmark array, or None on the first frame
+        elbow_id: MediaPipe landmark ID for elbow
+        shoulder_id: MediaPipe landmark ID for shoulder
+        raise_min: Minimum elbow-above-shoulder distance (range of movement)
+        delta_thr: Minimum upward movement per frame (speed of movement)
+
+    Returns:
+        True if gesture detected
+    """
+    vertical_diff = curr[shoulder_id, 1] - curr[elbow_id, 1]
+    if vertical_diff > raise_min:
+        return True
+    if prev is None:
+        return False
+    # Negative delta_y means the elbow moved up since the previous frame
+    return bool(vertical_diff > 0 and curr[elbow_id, 1] - prev[elbow_id, 1] < -delta_thr)
+
+
+def _arm_forward(curr: np.ndarray, prev: np.ndarray, wrist_id: int, delta_thr: float) -> bool:
+    """
+    Wrist moved toward the camera (positive Z delta) fast enough.
+
+    Args:
+        curr: Current landmark array
+        prev: Previous frame's landmark array
+        wrist_id: MediaPipe landmark ID for wrist
+        delta_thr: Minimum forward movement per frame
+
+    Returns:
+        True if gesture detected
+    """
+    return bool(curr[wrist_id, 2] - prev[wrist_id, 2] > delta_thr)
+
+
+def _shoulder_shrugged(curr: np.ndarray, raised_id: int, other_id: int,
+                       shrug_min: float) -> bool:
+    """
+    One shoulder sits higher than the other by more than shrug_min.
+
+    Args:
+        curr: Current landmark array
+        raised_id: MediaPipe landmark ID of the shoulder being shrugged
+        other_id: MediaPipe landmark ID of the opposite shoulder
+        shrug_min: Minimum height asymmetry
+
+    Returns:
+        True if gesture detected
+    """
+    return bool(curr[other_id, 1] - curr[raised_id, 1] > shrug_min)
+
+
+def _draw_pose(image: np.ndarray, landmarks) -> None:
+    """
+    Draw the pose skeleton onto a BGR image in place.
+
+    Same look as mp_drawing.draw_landmarks with our old drawing specs, but
+    coordinates are converted once with NumPy and all edges go to OpenCV in
+    a single polylines call instead of a Python loop per landmark and edge.
+
+    Args:
+        image: BGR frame to draw on
+        landmarks: Pose landmarks (NormalizedLandmarkList)
+    """
+    h, w = image.shape[:2]
+    xyv = np.fromiter(
+        (v for lm in landmarks.landmark for v in (lm.x, lm.y, lm.visibility)),
+        dtype=np.float32, count=NUM_POSE_LANDMARKS * 3
+    ).reshape(NUM_POSE_LANDMARKS, 3)
+
+    x, y, vis = xyv[:, 0], xyv[:, 1], xyv[:, 2]
+    shown = (vis >= _VISIBILITY_THRESHOLD) & (x >= 0) & (x <= 1) & (y >= 0) & (y <= 1)
+    pts = np.empty((NUM_POSE_LANDMARKS, 2), dtype=np.int32)
+    pts[:, 0] = np.minimum(x * w, w - 1)
+    pts[:, 1] = np.minimum(y * h, h - 1)
+
+    # Connections where both ends are shown, then points on top
+    edges = _POSE_EDGES[shown[_POSE_EDGES].all(axis=1)]
+    if len(edges):
+        cv2.polylines(image, list(pts[edges]), False, (0, 255, 255), 2)
+    for px, py in pts[shown].tolist():
+        cv2.circle(image, (px, py), 3, (224, 224, 224), 2)   # white border
+        cv2.circle(image, (px, py), 2, (0, 255, 0), 2)
 
 
 class GestureDetector:
     """Detects body movements using MediaPipe Pose."""
 
-    def __init__(self, camera_index: int = 0):
+    def __init__(self, camera_index: int = 0,
+                 frame_size: Tuple[int, int] = DEFAULT_FRAME_SIZE,
+                 model_complexity: int = 0,
+                 min_tracking_confidence: float = DEFAULT_MIN_TRACKING_CONFIDENCE,
+                 inference_size: Optional[Tuple[int, int]] = None):
         """
         Initialize gesture detector with camera and MediaPipe Pose.
 
         Args:
             camera_index: Camera number passed to Picamera2 (0 for the first camera)
+            frame_size: (width, height) of captured frames
+            model_complexity: MediaPipe landmark model (0 lite, 1 full, 2 heavy).
+                0 is fastest — important for RPi5 real-time performance
+            min_tracking_confidence: Landmark confidence (0.0-1.0) needed to keep
+                tracking from the previous frame's pose region. Below it, the
+                pose detector runs again on the next frame; lower values skip
+                the detector more often at the cost of recovering from lost
+                tracking more slowly
+            inference_size: (width, height) to downscale frames to before Pose
+                inference, or None to use captured frames as they are. Landmarks
+                are normalized, so gestures are unaffected; the dashboard still
+                shows the full frame. Not applied while face tracking is on
+
+        Raises:
+            ValueError: If model_complexity is not 0, 1 or 2,
+                min_tracking_confidence is outside 0.0-1.0, or inference_size
+                is not two positive integers
+            RuntimeError: If the camera cannot be opened
         """
+        # Validate before touching the camera so a bad value fails fast
+        if model_complexity not in (0, 1, 2):
+            raise ValueError("model_complexity must be 0, 1 or 2")
+        if not 0.0 <= min_tracking_confidence <= 1.0:
+            raise ValueError("min_tracking_confidence must be between 0.0 and 1.0")
+        if inference_size is not None:
+            inference_size = tuple(inference_size)
+            if len(inference_size) != 2 or not all(isinstance(v, int) and v > 0 for v in inference_size):
+                raise ValueError("inference_size must be a (width, height) pair of positive integers")
+        self.inference_size = inference_size
+        self._inference_buf = None            # reused destination for the downscaled frame
+        self.model_complexity = model_complexity
+        self.min_tracking_confidence = min_tracking_confidence
+
         # Initialize Picamera2 (Pi Camera Module via libcamera)
         try:
-            from picamera2 import Picamera2
+            from picamera2 import Picamera2, MappedArray
+            self._mapped_array = MappedArray
             self._picam = Picamera2(camera_num=camera_index)
+            # The ISP scales and emits RGB directly (no MJPG/YUYV decode on the
+            # CPU). Pin the sensor to CAPTURE_FPS so the capture thread isn't
+            # copying frames that inference will never look at.
+            frame_us = int(1_000_000 / CAPTURE_FPS)
             config = self._picam.create_preview_configuration(
-                main={"size": (640, 480), "format": "RGB888"}
+                main={"size": tuple(frame_size), "format": "RGB888"},
+                controls={"FrameDurationLimits": (frame_us, frame_us)}
             )
             self._picam.configure(config)
             self._picam.start()
@@ -32,48 +217,193 @@ class GestureDetector:
         except Exception as e:
             raise RuntimeError(f"Failed to open camera {camera_index}: {e}")
 
-        # Initialize MediaPipe Holistic (pose + face mesh in one pass)
-        # model_complexity=0 is fastest — important for RPi5 real-time performance
-        self.mp_pose = mp.solutions.pose      # kept for PoseLandmark enums and POSE_CONNECTIONS
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.holistic = mp.solutions.holistic.Holistic(
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-            model_complexity=0
-        )
+        # Initialize MediaPipe. Start with Pose only; detect_pressed() switches to
+        # Holistic (pose + face mesh + hands) only while a face gesture is mapped,
+        # since Holistic roughly doubles per-frame inference cost on the Pi.
+        self.mp_pose = mp.solutions.pose
+        self._use_holistic = False
+        self.pose_model = self._create_pose_model(use_holistic=False)
 
         # State tracking
-        self.previous_landmarks = None
-        self.current_frame = None             # BGR, for OpenCV drawing / web feed
+        # (RGB frame as captured, its pose landmarks or None) for the dashboard.
+        # Published as one tuple after inference, so a reader on another thread
+        # never pairs a new frame with the previous frame's landmarks.
+        # The frame is not copied; BGR is made on demand.
+        self._display: Optional[Tuple[np.ndarray, object]] = None
+        self._annotated_buf = None            # reused BGR buffer for the web feed overlay
         self.current_landmarks = None         # pose landmarks (NormalizedLandmarkList)
+        # Landmark double buffer: frames alternate between _xyz[0] and _xyz[1],
+        # so filling the current frame never allocates or clobbers the previous one
+        self._xyz = np.zeros((2, NUM_POSE_LANDMARKS, 3), dtype=np.float32)
+        self._xyz_views = (self._xyz[0], self._xyz[1])
+        self._xyz_flat = (self._xyz[0].reshape(-1), self._xyz[1].reshape(-1))
+        self._cur_idx = 0                     # buffer the next pose is written to
+        self._curr_xyz = None                 # view of current pose landmarks (33, 3)
+        self._prev_xyz = None                 # view of previous frame's landmarks
         self.current_face_landmarks = None    # face mesh landmarks (468 points)
         self.last_frame_time = time.time()
 
+        # Diagnostic log counters
+        self._pose_detection_counter = 0      # consecutive frames without a pose
+        self._debug_counter = 0               # elbow-raise checks since last diagnostic
+        self._first_check_logged = False
+
         # Detection thresholds
         self.thresholds = {
             'delta_threshold': 0.03,  # Speed of movement
             'raise_minimum': 0.10,    # Range of movement
             'shrug_minimum': 0.05,    # Shoulder height asymmetry for shrug
-            'mouth_open_minimum': 0.02  # Lip-gap (lower_lip.y - upper_lip.y) via face mesh
+            'mouth_open_minimum': 0.02,  # Lip-gap (lower_lip.y - upper_lip.y) via face mesh
+            'motion_minimum': 0.0     # Mean thumbnail change (0-255) needed to re-run inference; 0 disables (opt-in, untuned)
+        }
+        # Read-only live view for get_thresholds(), and plain float attributes
+        # for the per-frame checks; both kept current by update_thresholds()
+        self._thresholds_view = MappingProxyType(self.thresholds)
+        self._cache_thresholds()
+        self._motion_ref = None               # thumbnail of the last inferred frame
+        self._last_pose_found = False         # whether that inference found a pose
+        self._motion_skipped = False          # frames were skipped since that inference
+
+        # Gesture name -> zero-argument check, so detect_pressed() dispatches
+        # with one dict lookup instead of walking an if/elif chain
+        self._check_fns = {
+            'left_elbow_raise': lambda: self._check_elbow_raise(LEFT_ELBOW, LEFT_SHOULDER),
+            'right_elbow_raise': lambda: self._check_elbow_raise(RIGHT_ELBOW, RIGHT_SHOULDER),
+            'left_arm_forward': lambda: self._check_arm_forward(LEFT_WRIST),
+            'right_arm_forward': lambda: self._check_arm_forward(RIGHT_WRIST),
+            'left_shoulder_shrug': lambda: self._check_shoulder_shrug('left'),
+            'right_shoulder_shrug': lambda: self._check_shoulder_shrug('right'),
+            'mouth_open': self._check_mouth_open,
         }
+        # Dispatch plan for the last mappings seen by detect_pressed()
+        self._plan = []
+        self._plan_buttons = ()
+        self._pressed_sets = {0: frozenset()}
+        self._plan_needs_face = False
+        self._plan_mappings = {}
+
+        # Capture runs on its own thread so inference starts on the newest frame
+        # instead of blocking until the camera delivers the next one. Only the
+        # latest frame is kept; frames inference could not keep up with are dropped.
+        self._frame_cond = threading.Condition()
+        self._latest_rgb = None
+        self._consumed_rgb = None             # frame last handed to inference
+        # Frames are copied out of the camera's DMA buffers into these instead
+        # of a fresh ~900 KB array per frame (see _capture_loop)
+        width, height = frame_size
+        self._frame_pool = [np.empty((height, width, 3), dtype=np.uint8)
+                            for _ in range(FRAME_POOL_SIZE)]
+        self._latest_seq = 0                  # bumped for every captured frame
+        self._consumed_seq = 0                # last sequence handed to inference
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, name='CameraCapture', daemon=True
+        )
+        self._capture_thread.start()
 
     # ------------------------------------------------------------------
-    # Frame capture helpers
+    # Model / frame capture helpers
     # ------------------------------------------------------------------
 
-    def _capture_rgb(self) -> Optional[np.ndarray]:
+    def _create_pose_model(self, use_holistic: bool):
         """
-        Grab one frame from the camera.
+        Build the MediaPipe graph used for inference.
+
+        Args:
+            use_holistic: True for Holistic (needed for face mesh), False for Pose only
+
+        Returns:
+            MediaPipe solution object exposing process(rgb_frame)
+        """
+        solution = mp.solutions.holistic.Holistic if use_holistic else self.mp_pose.Pose
+        # Video mode: the pose detector only runs when tracking is lost; other
+        # frames take their region of interest from the previous landmarks
+        return solution(
+            static_image_mode=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=self.min_tracking_confidence,
+            model_complexity=self.model_complexity
+        )
+
+    def _set_face_tracking(self, enabled: bool):
+        """
+        Swap between the Pose-only and Holistic graphs.
+
+        Args:
+            enabled: True if a mapped gesture needs face mesh landmarks
+        """
+        if enabled == self._use_holistic:
+            return
+        old_model = self.pose_model
+        self.pose_model = self._create_pose_model(use_holistic=enabled)
+        self._use_holistic = enabled
+        self.current_face_landmarks = None
+        if old_model is not None:
+            old_model.close()
+
+    def _capture_loop(self):
+        """Continuously copy camera frames into pooled buffers and publish the newest."""
+        picam = self._picam
+        mapped_array = self._mapped_array
+        pool = self._frame_pool
+        slot = 0
+        while self._camera_started:
+            # Next buffer nobody is using: not the frame waiting for inference,
+            # the one being processed, or the one on the dashboard. The pool has
+            # spares, so one is always free.
+            with self._frame_cond:
+                busy = (self._latest_rgb, self._consumed_rgb)
+            display = self._display
+            shown = display[0] if display is not None else None
+            while pool[slot] is busy[0] or pool[slot] is busy[1] or pool[slot] is shown:
+                slot = (slot + 1) % FRAME_POOL_SIZE
+            frame = pool[slot]
+
+            try:
+                request = picam.capture_request()
+                try:
+                    with mapped_array(request, 'main') as mapped:
+                        src = mapped.array
+                        if frame.shape != src.shape:
+                            # The ISP may round the configured size; adopt its shape
+                            frame = pool[slot] = np.empty_like(src)
+                        frame.flags.writeable = True  # inference marks frames read-only
+                        np.copyto(frame, src)
+                finally:
+                    request.release()
+            except Exception:
+                if not self._camera_started:
+                    break
+                time.sleep(0.1)
+                continue
+            slot = (slot + 1) % FRAME_POOL_SIZE
+
+            with self._frame_cond:
+                self._latest_rgb = frame
+                self._latest_seq += 1
+                self._frame_cond.notify_all()
+
+    def _capture_rgb(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Take the newest captured frame, waiting for one not yet consumed.
+
+        Args:
+            timeout: Maximum seconds to wait for a new frame
 
         Returns:
             RGB numpy array (H x W x 3), or None on failure.
         """
         if not self._camera_started:
             return None
-        try:
-            return self._picam.capture_array()
-        except Exception:
-            return None
+        with self._frame_cond:
+            has_frame = self._frame_cond.wait_for(
+                lambda: self._latest_seq != self._consumed_seq or not self._camera_started,
+                timeout=timeout
+            )
+            if not has_frame or not self._camera_started:
+                return None
+            self._consumed_seq = self._latest_seq
+            self._consumed_rgb = self._latest_rgb
+            return self._consumed_rgb
 
     # ------------------------------------------------------------------
     # Public API
@@ -90,22 +420,76 @@ class GestureDetector:
         if rgb_frame is None:
             return None
 
-        # Store BGR copy for OpenCV drawing / web feed
-        self.current_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
-
-        # Picamera2 delivers RGB888 — pass directly to MediaPipe (no conversion needed)
-        results = self.holistic.process(rgb_frame)
-
-        # Always update face landmarks (may be None if face not visible)
-        self.current_face_landmarks = results.face_landmarks
-
-        if results.pose_landmarks:
-            self.current_landmarks = results.pose_landmarks
-            return results.pose_landmarks
+        # Patients are often still between reps. If the scene hasn't changed since
+        # the last inference, reuse its result instead of running the model again;
+        # unchanged landmarks give zero deltas, so gestures hold their state.
+        # Face gestures are too small to register on the thumbnail, so the gate
+        # is off while the face mesh is in use.
+        motion_min = self._motion_min
+        if motion_min > 0 and not self._use_holistic:
+            thumb = cv2.resize(rgb_frame, MOTION_THUMB_SIZE, interpolation=cv2.INTER_AREA)
+            if (self._motion_ref is not None and
+                    cv2.norm(thumb, self._motion_ref, cv2.NORM_L1) < motion_min * thumb.size):
+                landmarks = self.current_landmarks if self._last_pose_found else None
+                self._display = (rgb_frame, landmarks)
+                self._motion_skipped = True
+                return landmarks
+            self._motion_ref = thumb
+        else:
+            self._motion_ref = None
+
+        # MediaPipe scales every frame down to its model inputs (≤256 px) anyway,
+        # so a smaller frame costs less to hand over with little accuracy loss.
+        # The face mesh needs the detail for the lip gap, so Holistic gets the
+        # full frame.
+        model_input = rgb_frame
+        if self.inference_size is not None and not self._use_holistic:
+            buf = self._inference_buf
+            if buf is None:
+                width, height = self.inference_size
+                buf = self._inference_buf = np.empty((height, width, 3), dtype=np.uint8)
+            buf.flags.writeable = True
+            model_input = cv2.resize(rgb_frame, self.inference_size, dst=buf,
+                                     interpolation=cv2.INTER_AREA)
+
+        # Picamera2 delivers RGB888 — pass directly to MediaPipe (no conversion needed).
+        # A read-only array is wrapped by reference instead of copied into the graph;
+        # the capture thread never rewrites a pooled frame while it is in use.
+        model_input.flags.writeable = False
+        results = self.pose_model.process(model_input)
+
+        # Always update face landmarks (may be None if face not visible);
+        # the Pose-only graph has no face output at all
+        if self._use_holistic:
+            self.current_face_landmarks = results.face_landmarks
+
+        landmarks = results.pose_landmarks
+        if landmarks:
+            self.current_landmarks = landmarks
+            # Materialize x/y/z once per frame so gesture checks work on a flat
+            # array instead of repeated protobuf attribute lookups
+            idx = self._cur_idx
+            self._xyz_flat[idx][:] = [
+                v for lm in landmarks.landmark for v in (lm.x, lm.y, lm.z)
+            ]
+            self._curr_xyz = self._xyz_views[idx]
+            self._last_pose_found = True
+            if self._motion_skipped:
+                # The delta since the last inference spans several frames of
+                # slow drift; comparing it with the per-frame delta_threshold
+                # would read it as one fast movement, so start over from here
+                self._prev_xyz = self._curr_xyz
+        else:
+            landmarks = None
+            self._last_pose_found = False
+        self._motion_skipped = False
 
-        return None
+        # Keep a reference only — BGR conversion is deferred to get_current_frame(),
+        # so frames the dashboard never asks for cost no conversion or copy
+        self._display = (rgb_frame, landmarks)
+        return landmarks
 
-    def calculate_landmark_delta(self, landmark_id: int) -> Optional[Tuple[float, float, float]]:
+    def calculate_landmark_delta(self, landmark_id: int) -> Optional[np.ndarray]:
         """
         Calculate the change in position for a specific landmark.
 
@@ -113,55 +497,43 @@ class GestureDetector:
             landmark_id: MediaPipe landmark ID
 
         Returns:
-            Tuple of (delta_x, delta_y, delta_z) or None if no previous landmarks
+            Array of (delta_x, delta_y, delta_z) or None if no previous landmarks
         """
-        if self.previous_landmarks is None or self.current_landmarks is None:
+        if self._prev_xyz is None or self._curr_xyz is None:
             return None
 
-        prev = self.previous_landmarks.landmark[landmark_id]
-        curr = self.current_landmarks.landmark[landmark_id]
-
-        delta_x = curr.x - prev.x
-        delta_y = curr.y - prev.y
-        delta_z = curr.z - prev.z
-
-        return (delta_x, delta_y, delta_z)
+        return self._curr_xyz[landmark_id] - self._prev_xyz[landmark_id]
 
     def get_current_frame(self) -> Optional[np.ndarray]:
         """
         Get the current frame with pose overlay for dashboard visualization.
 
-        If no frame has been processed yet, reads a fresh frame from the camera.
+        Never runs inference itself: until detect_pressed() has processed a
+        frame, the latest captured frame is shown without landmarks.
 
         Returns:
-            BGR frame with pose landmarks drawn, or None if camera is unavailable
+            BGR frame with pose landmarks drawn, or None if no frame is available yet
         """
-        if self.current_frame is None:
-            # No frame processed yet — grab one directly for the web feed
-            rgb_frame = self._capture_rgb()
+        display = self._display  # one read: frame and landmarks always match
+        if display is None:
+            # Peek at the capture slot without consuming it, so the detection
+            # loop still gets this frame
+            with self._frame_cond:
+                rgb_frame = self._latest_rgb
             if rgb_frame is None:
                 return None
-            results = self.holistic.process(rgb_frame)
-            frame_to_use = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
-            landmarks_to_use = results.pose_landmarks if results.pose_landmarks else None
+            landmarks_to_use = None
         else:
-            frame_to_use = self.current_frame.copy()
-            landmarks_to_use = self.current_landmarks
+            rgb_frame, landmarks_to_use = display
 
-        annotated_frame = frame_to_use.copy()
+        # Convert straight into the persistent overlay buffer: one pass replaces
+        # the former convert + copy + copy (~900 KB each at 640x480)
+        if self._annotated_buf is None or self._annotated_buf.shape != rgb_frame.shape:
+            self._annotated_buf = np.empty_like(rgb_frame)
+        annotated_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR, dst=self._annotated_buf)
 
         if landmarks_to_use:
-            self.mp_drawing.draw_landmarks(
-                annotated_frame,
-                landmarks_to_use,
-                self.mp_pose.POSE_CONNECTIONS,
-                landmark_drawing_spec=self.mp_drawing.DrawingSpec(
-                    color=(0, 255, 0), thickness=2, circle_radius=2
-                ),
-                connection_drawing_spec=self.mp_drawing.DrawingSpec(
-                    color=(0, 255, 255), thickness=2
-                )
-            )
+            _draw_pose(annotated_frame, landmarks_to_use)
 
         # FPS counter
         current_time = time.time()
@@ -182,7 +554,8 @@ class GestureDetector:
 
     def update_thresholds(self, delta: float, raise_min: float,
                           shrug_min: Optional[float] = None,
-                          mouth_open_min: Optional[float] = None):
+                          mouth_open_min: Optional[float] = None,
+                          motion_min: Optional[float] = None):
         """
         Update detection thresholds in real-time.
 
@@ -191,6 +564,7 @@ class GestureDetector:
             raise_min: New raise_minimum value (range of movement)
             shrug_min: Shoulder height asymmetry threshold for shrug gestures
             mouth_open_min: Normalized nose-to-mouth threshold for mouth open
+            motion_min: Mean thumbnail change needed to re-run inference (0 disables)
         """
         self.thresholds['delta_threshold'] = delta
         self.thresholds['raise_minimum'] = raise_min
@@ -198,15 +572,37 @@ class GestureDetector:
             self.thresholds['shrug_minimum'] = shrug_min
         if mouth_open_min is not None:
             self.thresholds['mouth_open_minimum'] = mouth_open_min
-
-    def get_thresholds(self) -> dict:
+        if motion_min is not None:
+            self.thresholds['motion_minimum'] = motion_min
+        self._cache_thresholds()
+
+    def _cache_thresholds(self):
+        """Mirror threshold values into attributes read by the per-frame checks."""
+        t = self.thresholds
+        self._delta_thr = t['delta_threshold']
+        self._raise_min = t['raise_minimum']
+        self._shrug_min = t['shrug_minimum']
+        self._mouth_open_min = t['mouth_open_minimum']
+        self._motion_min = t['motion_minimum']
+
+    def get_thresholds(self) -> Mapping[str, float]:
         """
         Get current detection thresholds.
 
         Returns:
-            Dictionary of threshold values
+            Read-only live view of the threshold values (use dict() for a snapshot)
+        """
+        return self._thresholds_view
+
+    def get_landmark_array(self) -> Optional[np.ndarray]:
+        """
+        Get the landmarks of the last frame with a pose.
+
+        Returns:
+            (33, 3) float32 view of landmark x/y/z, valid until the next frame
+            is processed, or None if no pose has been found yet
         """
-        return self.thresholds.copy()
+        return self._curr_xyz
 
     def is_active(self) -> bool:
         """
@@ -228,83 +624,103 @@ class GestureDetector:
         elapsed = current_time - self.last_frame_time
         return 1.0 / elapsed if elapsed > 0 else 0.0
 
-    def detect_gestures(self, mappings: dict) -> List[Tuple[str, str]]:
+    def detect_pressed(self, mappings: Mapping[str, str]) -> Optional[FrozenSet[str]]:
         """
-        Process one frame and detect configured gestures.
+        Process one frame and return the buttons whose gestures are detected.
+
+        A button counts as pressed if any gesture mapped to it is detected;
+        every other mapped button is released.
 
         Args:
-            mappings: Dictionary mapping gesture names to button names
+            mappings: Mapping of gesture names to button names
 
         Returns:
-            List of (button_name, action) tuples where action is 'press' or 'release'
+            Set of pressed button names, or None if no pose was found in the frame
         """
-        detected_events = []
+        # Mappings rarely change; re-specialize only when they do
+        if mappings != self._plan_mappings:
+            self._compile_plan(mappings)
+
+        # Only pay for the face mesh while a face gesture is actually mapped
+        self._set_face_tracking(self._plan_needs_face)
 
         # Process current frame
         landmarks = self.process_frame()
         if landmarks is None:
             # No pose detected - this is normal if person not in frame
             # Log occasionally to help debugging
-            if not hasattr(self, '_pose_detection_counter'):
-                self._pose_detection_counter = 0
             self._pose_detection_counter += 1
             if self._pose_detection_counter % 150 == 0:  # Log every 150 frames (~1 minute at 2.5 FPS)
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.debug("No pose detected in frame - make sure you're visible to the camera")
-            return detected_events
+            return None
 
         # Reset counter when pose is detected
-        if hasattr(self, '_pose_detection_counter'):
-            if self._pose_detection_counter > 0:
-                import logging
-                logger = logging.getLogger(__name__)
+        if self._pose_detection_counter > 0:
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Pose detected! (after {self._pose_detection_counter} frames without detection)")
             self._pose_detection_counter = 0
 
-        # MediaPipe landmark indices
-        LEFT_ELBOW = self.mp_pose.PoseLandmark.LEFT_ELBOW.value
-        RIGHT_ELBOW = self.mp_pose.PoseLandmark.RIGHT_ELBOW.value
-        LEFT_WRIST = self.mp_pose.PoseLandmark.LEFT_WRIST.value
-        RIGHT_WRIST = self.mp_pose.PoseLandmark.RIGHT_WRIST.value
-        LEFT_SHOULDER = self.mp_pose.PoseLandmark.LEFT_SHOULDER.value
-        RIGHT_SHOULDER = self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value
-
-        # Check each configured gesture
-        for gesture_name, button_name in mappings.items():
-            gesture_detected = False
-
-            if gesture_name == "left_elbow_raise":
-                gesture_detected = self._check_elbow_raise(LEFT_ELBOW, LEFT_SHOULDER)
-
-            elif gesture_name == "right_elbow_raise":
-                gesture_detected = self._check_elbow_raise(RIGHT_ELBOW, RIGHT_SHOULDER)
-
-            elif gesture_name == "left_arm_forward":
-                gesture_detected = self._check_arm_forward(LEFT_WRIST)
-
-            elif gesture_name == "right_arm_forward":
-                gesture_detected = self._check_arm_forward(RIGHT_WRIST)
+        # Run the precompiled checks
+        mask = 0
+        for check, bit in self._plan:
+            if check():
+                mask |= bit
+        pressed = self._pressed_sets.get(mask)
+        if pressed is None:
+            pressed = self._pressed_sets[mask] = frozenset(
+                [button for i, button in enumerate(self._plan_buttons) if mask >> i & 1])
+
+        # Current landmarks become the previous frame's. Flip buffers only if
+        # this frame wrote new ones (frames skipped by the motion gate didn't),
+        # so the next pose never overwrites the landmarks it is compared against.
+        self._prev_xyz = self._curr_xyz
+        if self._curr_xyz is self._xyz_views[self._cur_idx]:
+            self._cur_idx ^= 1
+
+        return pressed
+
+    def detect_gestures(self, mappings: Mapping[str, str]) -> List[Tuple[str, str]]:
+        """
+        Process one frame and detect configured gestures.
 
-            elif gesture_name == "left_shoulder_shrug":
-                gesture_detected = self._check_shoulder_shrug('left')
+        Event-list form of detect_pressed(), kept for callers that want one
+        entry per mapping.
 
-            elif gesture_name == "right_shoulder_shrug":
-                gesture_detected = self._check_shoulder_shrug('right')
+        Args:
+            mappings: Dictionary mapping gesture names to button names
 
-            elif gesture_name == "mouth_open":
-                gesture_detected = self._check_mouth_open()
+        Returns:
+            List of (button_name, action) tuples where action is 'press' or 'release'
+            (empty if no pose was found)
+        """
+        pressed = self.detect_pressed(mappings)
+        if pressed is None:
+            return []
+        return [(button_name, 'press' if button_name in pressed else 'release')
+                for button_name in mappings.values()]
 
-            # Generate press/release events based on detection
-            if gesture_detected:
-                detected_events.append((button_name, 'press'))
-            else:
-                detected_events.append((button_name, 'release'))
+    def _compile_plan(self, mappings: Mapping[str, str]):
+        """
+        Specialize gesture dispatch for a mapping set.
 
-        # Update previous landmarks for next frame
-        self.previous_landmarks = self.current_landmarks
+        Resolves each gesture name to its check function once, so
+        detect_pressed() does no name lookups per frame. Gesture names with
+        no detector are left out; their buttons are never pressed.
 
-        return detected_events
+        Args:
+            mappings: Dictionary mapping gesture names to button names
+        """
+        planned = [(self._check_fns[gesture_name], button_name)
+                   for gesture_name, button_name in mappings.items()
+                   if gesture_name in self._check_fns]
+        # One bit per button, so a frame's result is an int and the pressed
+        # set for each combination is built once and then reused
+        self._plan_buttons = tuple(dict.fromkeys(button for _, button in planned))
+        bits = {button: 1 << i for i, button in enumerate(self._plan_buttons)}
+        self._plan = [(check, bits[button]) for check, button in planned]
+        self._pressed_sets = {0: frozenset()}
+        self._plan_needs_face = not FACE_GESTURES.isdisjoint(mappings)
+        self._plan_mappings = dict(mappings)
 
     def _check_elbow_raise(self, elbow_id: int, shoulder_id: int) -> bool:
         """
@@ -317,65 +733,42 @@ class GestureDetector:
         Returns:
             True if gesture detected
         """
-        if self.current_landmarks is None:
+        curr, prev = self._curr_xyz, self._prev_xyz
+        if curr is None:
             return False
 
-        elbow = self.current_landmarks.landmark[elbow_id]
-        shoulder = self.current_landmarks.landmark[shoulder_id]
-
-        # Check if elbow is raised (Y decreases upward in image coordinates)
-        # Positive vertical_diff means elbow is above shoulder
-        vertical_diff = shoulder.y - elbow.y
-
-        # Check if elbow is currently raised (position check)
-        is_raised = vertical_diff > self.thresholds['raise_minimum']
-
-        # If we have previous frame, also check for upward movement
-        if self.previous_landmarks is not None:
-            delta = self.calculate_landmark_delta(elbow_id)
-            if delta:
-                # delta[1] is negative when moving upward (Y decreases upward)
-                # So we want delta_y to be negative (moving up) OR already raised
-                delta_y = delta[1]  # Keep sign - negative means moving up
-
-                # Check if moving upward (negative delta_y) with sufficient speed
-                moving_up = delta_y < -self.thresholds['delta_threshold']
-
-                # Gesture detected if:
-                # 1. Elbow is currently raised above threshold, OR
-                # 2. Elbow is moving upward with sufficient speed
-                detected = is_raised or (moving_up and vertical_diff > 0)
-
-                # Log diagnostic info occasionally (every 50 frames to help debugging)
-                if hasattr(self, '_debug_counter'):
-                    self._debug_counter += 1
-                else:
-                    self._debug_counter = 0
-
-                if self._debug_counter % 50 == 0:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.info(
-                        f"Elbow raise: vertical_diff={vertical_diff:.3f} "
-                        f"(min={self.thresholds['raise_minimum']:.3f}), "
-                        f"delta_y={delta_y:.3f} (threshold={self.thresholds['delta_threshold']:.3f}), "
-                        f"is_raised={is_raised}, moving_up={moving_up}, detected={detected}"
-                    )
-
-                return detected
+        raise_min = self._raise_min
+        delta_thr = self._delta_thr
+        detected = _elbow_raised(curr, prev, elbow_id, shoulder_id, raise_min, delta_thr)
+
+        # Diagnostics are recomputed here so the check itself stays pure
+        if prev is not None:
+            # Log diagnostic info occasionally (every 50 frames to help debugging)
+            self._debug_counter += 1
+            if self._debug_counter % 50 == 0 and logger.isEnabledFor(logging.INFO):
+                vertical_diff = float(curr[shoulder_id, 1] - curr[elbow_id, 1])
+                delta_y = float(curr[elbow_id, 1] - prev[elbow_id, 1])
+                logger.info(
+                    f"Elbow raise: vertical_diff={vertical_diff:.3f} "
+                    f"(min={raise_min:.3f}), "
+                    f"delta_y={delta_y:.3f} (threshold={delta_thr:.3f}), "
+                    f"is_raised={vertical_diff > raise_min}, "
+                    f"moving_up={delta_y < -delta_thr}, detected={detected}"
+                )
+
+            return detected
 
         # If no previous frame, just check if currently raised
         # Log first check to help debugging
-        if not hasattr(self, '_first_check_logged'):
-            import logging
-            logger = logging.getLogger(__name__)
+        if not self._first_check_logged:
+            vertical_diff = float(curr[shoulder_id, 1] - curr[elbow_id, 1])
             logger.info(
                 f"Elbow raise (no previous frame): vertical_diff={vertical_diff:.3f} "
-                f"(threshold={self.thresholds['raise_minimum']:.3f}), detected={is_raised}"
+                f"(threshold={raise_min:.3f}), detected={detected}"
             )
             self._first_check_logged = True
 
-        return is_raised
+        return detected
 
     def _check_arm_forward(self, wrist_id: int) -> bool:
         """
@@ -387,18 +780,10 @@ class GestureDetector:
         Returns:
             True if gesture detected
         """
-        if self.current_landmarks is None or self.previous_landmarks is None:
+        if self._curr_xyz is None or self._prev_xyz is None:
             return False
 
-        # Check Z-axis movement (toward camera is positive)
-        delta = self.calculate_landmark_delta(wrist_id)
-        if delta is None:
-            return False
-
-        delta_z = delta[2]
-
-        # Check if moving forward with sufficient speed
-        return delta_z > self.thresholds['delta_threshold']
+        return _arm_forward(self._curr_xyz, self._prev_xyz, wrist_id, self._delta_thr)
 
     def _check_shoulder_shrug(self, shrug_side: str) -> bool:
         """
@@ -410,24 +795,15 @@ class GestureDetector:
         Returns:
             True if gesture detected
         """
-        if self.current_landmarks is None:
+        if self._curr_xyz is None:
             return False
 
-        LEFT_SHOULDER = self.mp_pose.PoseLandmark.LEFT_SHOULDER.value
-        RIGHT_SHOULDER = self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value
-
-        left_sh = self.current_landmarks.landmark[LEFT_SHOULDER]
-        right_sh = self.current_landmarks.landmark[RIGHT_SHOULDER]
-
-        # Y increases downward; a raised shoulder has a lower Y value.
-        # Left shrug: left shoulder above right → right.y - left.y > threshold
-        # Right shrug: right shoulder above left → left.y - right.y > threshold
         if shrug_side == 'left':
-            diff = right_sh.y - left_sh.y
+            raised_id, other_id = LEFT_SHOULDER, RIGHT_SHOULDER
         else:
-            diff = left_sh.y - right_sh.y
+            raised_id, other_id = RIGHT_SHOULDER, LEFT_SHOULDER
 
-        return diff > self.thresholds['shrug_minimum']
+        return _shoulder_shrugged(self._curr_xyz, raised_id, other_id, self._shrug_min)
 
     def _check_mouth_open(self) -> bool:
         """
@@ -449,23 +825,29 @@ class GestureDetector:
 
         lip_gap = lower_lip.y - upper_lip.y
 
-        return lip_gap > self.thresholds['mouth_open_minimum']
+        return lip_gap > self._mouth_open_min
 
     def cleanup(self):
         """Release camera and MediaPipe resources."""
         if getattr(self, '_camera_started', False):
+            self._camera_started = False
+            capture_thread = getattr(self, '_capture_thread', None)
+            if capture_thread is not None:
+                with self._frame_cond:
+                    self._frame_cond.notify_all()
+                if capture_thread is not threading.current_thread():
+                    capture_thread.join(timeout=2)
             try:
                 self._picam.stop()
                 self._picam.close()
             except Exception:
                 pass
-            self._camera_started = False
-        if hasattr(self, 'holistic') and self.holistic:
+        if getattr(self, 'pose_model', None):
             try:
-                self.holistic.close()
+                self.pose_model.close()
             except Exception:
                 pass
-            self.holistic = None
+            self.pose_model = None
 
     def __del__(self):
         """Ensure cleanup on deletion."""
@@ -0,0 +1,126 @@
+"""
+Shared-memory publishing of pose landmarks for optional consumer processes.
+
+The vision sensor can publish each frame's landmarks into one shared-memory
+block so debug UIs or recorders in other processes can follow the newest pose
+without a pipe or queue on the hot path. Publishing is a single memcpy; readers
+never block the writer.
+
+The sequence counter is a best-effort seqlock. Python has no release/acquire
+stores or memory fences, so on weakly ordered CPUs (the Pi 5's aarch64 cores)
+a reader on another core can see the counter change before or after the
+landmark stores it guards. A read can therefore return a frame mixing two
+poses even though the counter checks passed. That is fine for display and
+debugging; don't use it where a torn frame matters.
+
+Block layout:
+    bytes 0-7:  uint64 sequence counter (odd while a write is in progress)
+    bytes 8-:   float32 x/y/z for the 33 pose landmarks, shape (33, 3)
+
+Readers attach with multiprocessing.shared_memory.SharedMemory(name) and use
+read_landmarks(); a sequence number that hasn't changed means no new frame.
+"""
+
+import logging
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.gestures import NUM_POSE_LANDMARKS
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHM_NAME = 'playable_landmarks'
+
+_HEADER_BYTES = 8
+_LANDMARK_SHAPE = (NUM_POSE_LANDMARKS, 3)
+_BLOCK_BYTES = _HEADER_BYTES + NUM_POSE_LANDMARKS * 3 * 4
+
+
+def _views(buf) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (sequence counter, landmark array) views onto a block's buffer."""
+    seq = np.ndarray((1,), dtype=np.uint64, buffer=buf)
+    xyz = np.ndarray(_LANDMARK_SHAPE, dtype=np.float32, buffer=buf, offset=_HEADER_BYTES)
+    return seq, xyz
+
+
+class LandmarkPublisher:
+    """Writes the newest pose landmarks into a named shared-memory block."""
+
+    def __init__(self, name: str = DEFAULT_SHM_NAME):
+        """
+        Create the shared-memory block.
+
+        A block left behind by a previous run that crashed is replaced.
+
+        Args:
+            name: Shared-memory block name consumers attach to
+        """
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=_BLOCK_BYTES)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=_BLOCK_BYTES)
+        self.name = name
+        self._seq, self._xyz = _views(self._shm.buf)
+        self._seq[0] = 0
+        logger.info(f"Publishing landmarks to shared memory '{name}'")
+
+    def publish(self, xyz: np.ndarray):
+        """
+        Publish one frame's landmarks.
+
+        Args:
+            xyz: (33, 3) array of landmark x/y/z
+        """
+        seq = self._seq
+        seq[0] += 1      # odd: write in progress
+        self._xyz[:] = xyz
+        seq[0] += 1      # even: frame complete
+
+    def close(self):
+        """Release and remove the shared-memory block."""
+        if self._shm is None:
+            return
+        # Views must go before the mapping can be closed
+        self._seq = self._xyz = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+
+def read_landmarks(shm: shared_memory.SharedMemory,
+                   retries: int = 3) -> Optional[Tuple[int, np.ndarray]]:
+    """
+    Read the newest landmarks from an attached publisher block.
+
+    Best effort: the sequence checks catch most concurrent writes, but
+    without memory barriers a torn frame can still get through (see the
+    module docstring).
+
+    Args:
+        shm: Block attached by name (see LandmarkPublisher)
+        retries: Attempts before giving up if every read races a write
+
+    Returns:
+        (sequence number, (33, 3) float32 copy), or None if nothing has been
+        published yet or every attempt raced a write
+    """
+    seq, xyz = _views(shm.buf)
+    for _ in range(retries):
+        before = int(seq[0])
+        if before == 0:
+            return None
+        if before % 2:
+            continue  # write in progress
+        copy = xyz.copy()
+        if int(seq[0]) == before:
+            return before // 2, copy
+    return None
@@ -4,11 +4,46 @@ Gesture-to-button mapping configuration management.
 
 import json
 import os
-from typing import Dict, Optional
+import sys
+import threading
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Set
+
+try:
+    import orjson  # C implementation; stdlib json is used when it isn't installed
+except ImportError:
+    orjson = None
+
+
+# Gestures the detector knows and buttons the pipe protocol accepts. Lists keep
+# the order used in error messages; frozensets give O(1) validation.
+_GESTURE_NAMES = (
+    'left_elbow_raise',
+    'right_elbow_raise',
+    'left_arm_forward',
+    'right_arm_forward',
+    'left_shoulder_shrug',
+    'right_shoulder_shrug',
+    'mouth_open'
+)
+_BUTTON_NAMES = (
+    'CROSS', 'CIRCLE', 'SQUARE', 'TRIANGLE',
+    'L1', 'L2', 'R1', 'R2',
+    'L3', 'R3',
+    'UP', 'DOWN', 'LEFT', 'RIGHT',
+    'OPTIONS', 'PS'
+)
+_VALID_GESTURES = frozenset(_GESTURE_NAMES)
+_VALID_BUTTONS = frozenset(_BUTTON_NAMES)
+_VALID_GESTURES_STR = ', '.join(_GESTURE_NAMES)
+_VALID_BUTTONS_STR = ', '.join(_BUTTON_NAMES)
 
 
 class GestureMapping:
     """Manages gesture-to-button mappings and configuration persistence."""
+
+    # Config directories already created by save_mappings(), shared by all instances
+    _ensured_dirs: Set[str] = set()
     
     def __init__(self, config_file: str = 'config/mappings.json'):
         """
@@ -18,13 +53,19 @@ class GestureMapping:
             config_file: Path to JSON configuration file
         """
         self.config_file = config_file
+        # Copy-on-write: a mappings dict is never modified once assigned, so the
+        # views handed out by get_active_mappings() are stable snapshots that
+        # other threads can iterate safely
         self.mappings = {}
         self.thresholds = {
             'delta_threshold': 0.03,
             'shrug_minimum': 0.05,
             'mouth_open_minimum': 0.02,
-            'raise_minimum': 0.10
+            'raise_minimum': 0.10,
+            'motion_minimum': 0.0
         }
+        # (path, inode, mtime_ns, size) of the file last parsed into memory
+        self._loaded_key = None
         
         # Load existing configuration
         self.load_mappings(config_file)
@@ -40,22 +81,37 @@ class GestureMapping:
             Dictionary of gesture_name -> button_name mappings
         """
         try:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    config = json.load(f)
-                    
-                # Load mappings
-                self.mappings = config.get('mappings', {})
-                
-                # Load thresholds
-                if 'thresholds' in config:
-                    self.thresholds.update(config['thresholds'])
-                
-                return self.mappings
-            else:
+            try:
+                f = open(file_path, 'rb')
+            except FileNotFoundError:
                 # Create default configuration if file doesn't exist
                 self._create_default_config(file_path)
                 return self.mappings
+
+            with f:
+                st = os.fstat(f.fileno())
+                key = (file_path, st.st_ino, st.st_mtime_ns, st.st_size)
+                if key == self._loaded_key:
+                    # Unchanged since we last parsed it (add/remove reload every call)
+                    return self.mappings
+                # Read the whole file in one call and parse the bytes directly
+                data = f.read()
+                config = orjson.loads(data) if orjson else json.loads(data)
+
+            # Load mappings. Intern the names: JSON-parsed strings aren't, and
+            # interned keys and values match the name literals by identity in
+            # the detector's and sensor's per-frame dict and set lookups.
+            self.mappings = {
+                sys.intern(gesture_name): sys.intern(button) if isinstance(button, str) else button
+                for gesture_name, button in config.get('mappings', {}).items()
+            }
+
+            # Load thresholds
+            if 'thresholds' in config:
+                self.thresholds.update(config['thresholds'])
+
+            self._loaded_key = key
+            return self.mappings
                 
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in configuration file: {e}")
@@ -78,14 +134,39 @@ class GestureMapping:
         }
         
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            # Ensure directory exists (once per directory per process). A bare
+            # filename has no directory part and lives in the working directory.
+            config_dir = os.path.dirname(file_path)
+            if config_dir and config_dir not in GestureMapping._ensured_dirs:
+                os.makedirs(config_dir, exist_ok=True)
+                GestureMapping._ensured_dirs.add(config_dir)
             
-            # Write configuration
-            with open(file_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            if orjson:
+                data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config, indent=2).encode()
+
+            # Write a sibling temp file and rename it over the config, so a crash
+            # mid-write can't leave a truncated file and the vision sensor's live
+            # reload never reads a half-written one. The name is unique per
+            # process and thread since several instances may save concurrently.
+            tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
                 
         except Exception as e:
+            # The directory may have been removed since we created it
+            GestureMapping._ensured_dirs.discard(os.path.dirname(file_path))
             raise RuntimeError(f"Failed to save mappings: {e}")
     
     def add_mapping(self, gesture_name: str, button: str):
@@ -97,35 +178,17 @@ class GestureMapping:
             button: PlayStation button name (e.g., 'SQUARE', 'CIRCLE')
         """
         # Validate gesture name
-        valid_gestures = [
-            'left_elbow_raise',
-            'right_elbow_raise',
-            'left_arm_forward',
-            'right_arm_forward',
-            'left_shoulder_shrug',
-            'right_shoulder_shrug',
-            'mouth_open'
-        ]
-        
-        if gesture_name not in valid_gestures:
+        if gesture_name not in _VALID_GESTURES:
             raise ValueError(
                 f"Invalid gesture name: {gesture_name}. "
-                f"Valid gestures: {', '.join(valid_gestures)}"
+                f"Valid gestures: {_VALID_GESTURES_STR}"
             )
         
         # Validate button name
-        valid_buttons = [
-            'CROSS', 'CIRCLE', 'SQUARE', 'TRIANGLE',
-            'L1', 'L2', 'R1', 'R2',
-            'L3', 'R3',
-            'UP', 'DOWN', 'LEFT', 'RIGHT',
-            'OPTIONS', 'PS'
-        ]
-        
-        if button not in valid_buttons:
+        if button not in _VALID_BUTTONS:
             raise ValueError(
                 f"Invalid button name: {button}. "
-                f"Valid buttons: {', '.join(valid_buttons)}"
+                f"Valid buttons: {_VALID_BUTTONS_STR}"
             )
         
         # Reload from disk first so we don't clobber concurrent changes
@@ -135,8 +198,8 @@ class GestureMapping:
         except Exception:
             pass
 
-        # Add mapping
-        self.mappings[gesture_name] = button
+        # Add mapping (copy-on-write, see __init__), interned as in load_mappings()
+        self.mappings = {**self.mappings, sys.intern(gesture_name): sys.intern(button)}
         
         # Auto-save
         self.save_mappings()
@@ -155,20 +218,22 @@ class GestureMapping:
             pass
 
         if gesture_name in self.mappings:
-            del self.mappings[gesture_name]
+            mappings = dict(self.mappings)
+            del mappings[gesture_name]
+            self.mappings = mappings
             # Auto-save
             self.save_mappings()
         else:
             raise KeyError(f"Gesture mapping not found: {gesture_name}")
     
-    def get_active_mappings(self) -> Dict[str, str]:
+    def get_active_mappings(self) -> Mapping[str, str]:
         """
         Get currently active gesture mappings.
         
         Returns:
-            Dictionary of gesture_name -> button_name mappings
+            Read-only gesture_name -> button_name view (use dict() for a mutable copy)
         """
-        return self.mappings.copy()
+        return MappingProxyType(self.mappings)
     
     def get_thresholds(self) -> Dict[str, float]:
         """
@@ -182,7 +247,8 @@ class GestureMapping:
     def update_thresholds(self, delta_threshold: Optional[float] = None,
                          raise_minimum: Optional[float] = None,
                          shrug_minimum: Optional[float] = None,
-                         mouth_open_minimum: Optional[float] = None):
+                         mouth_open_minimum: Optional[float] = None,
+                         motion_minimum: Optional[float] = None):
         """
         Update detection thresholds.
 
@@ -191,6 +257,8 @@ class GestureMapping:
             raise_minimum: Range of movement threshold
             shrug_minimum: Shoulder height asymmetry threshold for shrug gestures
             mouth_open_minimum: Normalized nose-to-mouth threshold for mouth open
+            motion_minimum: Mean thumbnail change (0-255) needed to re-run
+                inference; 0 disables skipping unchanged frames
         """
         if delta_threshold is not None:
             if not 0.01 <= delta_threshold <= 2.0:
@@ -212,6 +280,11 @@ class GestureMapping:
                 raise ValueError("mouth_open_minimum must be between 0.0 and 2.0")
             self.thresholds['mouth_open_minimum'] = mouth_open_minimum
 
+        if motion_minimum is not None:
+            if not 0.0 <= motion_minimum <= 255.0:
+                raise ValueError("motion_minimum must be between 0.0 and 255.0")
+            self.thresholds['motion_minimum'] = motion_minimum
+
         # Auto-save
         self.save_mappings()
     
@@ -227,7 +300,8 @@ class GestureMapping:
                 'delta_threshold': 0.03,
                 'shrug_minimum': 0.05,
                 'mouth_open_minimum': 0.02,
-                'raise_minimum': 0.10
+                'raise_minimum': 0.10,
+                'motion_minimum': 0.0
             },
             'mappings': {
                 'left_elbow_raise': 'SQUARE',
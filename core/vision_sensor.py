@@ -6,20 +6,17 @@ button events to a Named Pipe for consumption by pyremoteplay.
 """
 
 import os
+import queue
+import select
+import threading
 import time
 import logging
-from typing import Dict, Set, Optional
-from core.gestures import GestureDetector
+import logging.handlers
+from typing import Dict, FrozenSet, List, Mapping, Set, Optional, Tuple
+from core.gestures import GestureDetector, DEFAULT_MIN_TRACKING_CONFIDENCE
 from core.mappings import GestureMapping
 
 
-# Configure logging (if not already configured by main)
-# Only configure if root logger has no handlers
-if not logging.getLogger().handlers:
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
 logger = logging.getLogger(__name__)
 
 # Debounce: how many consecutive frames a gesture must be in the same
@@ -27,13 +24,72 @@ logger = logging.getLogger(__name__)
 DEBOUNCE_PRESS_FRAMES = 3
 DEBOUNCE_RELEASE_FRAMES = 3
 
+# Nominal frame budget; the camera itself paces the loop (see CAPTURE_FPS in
+# core.gestures). All loop timing uses time.monotonic_ns(): integer
+# nanoseconds, immune to wall-clock (NTP) jumps.
+TARGET_FPS = 30
+FRAME_INTERVAL_NS = 1_000_000_000 // TARGET_FPS
+NS_PER_SEC = 1_000_000_000
+
+# How long the main loop waits for a detection result before doing its
+# housekeeping anyway (e.g. while the camera stalls). Also the idle wait
+# between housekeeping passes while the camera is unavailable.
+RESULT_WAIT_S = 0.1
+
+# SCHED_FIFO priority for the detector thread when realtime is enabled. Low
+# in the 1-99 range so kernel threads (camera, USB, network IRQs) still win.
+REALTIME_PRIORITY = 20
+
+# The pipe is written non-blocking so a stalled reader can't stall the vision
+# loop. Messages the pipe has no room for wait in a backlog that keeps only
+# the latest message per button (see _collapse_backlog).
+
+# Encoded pipe messages by (button_name, action). Only a few dozen exist, so
+# each is formatted and encoded once, the first time it is sent.
+_EVENT_BYTES: Dict[Tuple[str, str], bytes] = {}
+
+
+def _describe(events: List[Tuple[str, str]]) -> str:
+    """Format button events for log messages, e.g. 'SQUARE press, R1 release'."""
+    return ', '.join(f"{button_name} {action}" for button_name, action in events)
+
+
+def _collapse_backlog(messages: List[bytes]) -> List[bytes]:
+    """
+    Keep only the latest message per button, ordered by when it was queued.
+
+    A button's final state is all the PS5 needs, so superseded presses and
+    releases can go; the backlog is bounded by the number of buttons and a
+    release is never lost behind its press.
+    """
+    latest: Dict[bytes, bytes] = {}
+    for message in messages:
+        button_name = message.split(b'\n', 1)[0]
+        latest.pop(button_name, None)  # re-queue at the end
+        latest[button_name] = message
+    return list(latest.values())
+
+
+def _event_message(button_name: str, action: str) -> bytes:
+    """Return the encoded Hardware Producer message for a button event."""
+    try:
+        return _EVENT_BYTES[(button_name, action)]
+    except KeyError:
+        message = _EVENT_BYTES[(button_name, action)] = f"{button_name}\n{action}\n\n".encode()
+        return message
+
 
 class VisionSensor:
     """Main vision sensor that detects gestures and writes to Named Pipe."""
 
     def __init__(self, pipe_path: str = '/tmp/my_pipe', camera_index: int = 0,
                  gesture_detector: Optional[GestureDetector] = None,
-                 gesture_mapping: Optional[GestureMapping] = None):
+                 gesture_mapping: Optional[GestureMapping] = None,
+                 min_tracking_confidence: float = DEFAULT_MIN_TRACKING_CONFIDENCE,
+                 enable_shm_publish: bool = False,
+                 inference_size: Optional[Tuple[int, int]] = None,
+                 enable_realtime: bool = False,
+                 inference_core: Optional[int] = None):
         """
         Initialize Vision Sensor.
 
@@ -42,9 +98,24 @@ class VisionSensor:
             camera_index: Camera device index (only used if gesture_detector not provided)
             gesture_detector: Shared GestureDetector instance (optional, creates new if None)
             gesture_mapping: Shared GestureMapping instance (optional, creates new if None)
+            min_tracking_confidence: Pose tracking confidence for the GestureDetector
+                                     (only used if gesture_detector not provided)
+            enable_shm_publish: Publish each frame's landmarks to shared memory
+                                for other processes (see core.landmark_shm)
+            inference_size: (width, height) frames are downscaled to for Pose
+                            inference, or None for full frames (only used if
+                            gesture_detector not provided)
+            enable_realtime: Run the detector thread under SCHED_FIFO (Linux;
+                             needs root or CAP_SYS_NICE, skipped otherwise)
+            inference_core: CPU to pin the detector thread to when
+                            enable_realtime is set (None leaves affinity alone)
         """
         self.pipe_path = pipe_path
         self.camera_index = camera_index
+        self.min_tracking_confidence = min_tracking_confidence
+        self.inference_size = inference_size
+        self.enable_realtime = enable_realtime
+        self.inference_core = inference_core
 
         # Initialize gesture detection components
         self.gesture_detector = gesture_detector
@@ -57,32 +128,62 @@ class VisionSensor:
         self._debounce_press: Dict[str, int] = {}    # consecutive detected frames
         self._debounce_release: Dict[str, int] = {}  # consecutive absent frames
         self._debounced_pressed: Set[str] = set()    # buttons in confirmed-pressed state
+        # Buttons detected in the last frame that updated the counters (None
+        # forces an update); see the steady-state check in process_gesture_events
+        self._last_pressed: Optional[FrozenSet[str]] = None
 
-        # Performance monitoring
+        # Performance monitoring (timestamps are time.monotonic_ns() values)
+        now = time.monotonic_ns()
         self.frame_count = 0
-        self.start_time = time.time()
-        self.last_fps_log = time.time()
+        self.start_time = now
+        self.last_fps_log = now
+        self.fps_log_interval = 5 * NS_PER_SEC
 
         # Slow frame tracking (for aggregated warnings)
         self.slow_frame_count = 0
-        self.slow_frame_times = []
-        self.last_slow_frame_log = time.time()
-        self.slow_frame_log_interval = 10.0  # Log summary every 10 seconds
-
-        # Pipe file handle
-        self.pipe = None
+        # Running totals for the current log window (ns); only the average and
+        # maximum are reported, so individual frame times aren't kept
+        self.slow_frame_time_sum = 0
+        self.slow_frame_time_max = 0
+        self.last_slow_frame_log = now
+        self.slow_frame_log_interval = 10 * NS_PER_SEC  # Log summary every 10 seconds
+
+        # Pipe file descriptor (raw, unbuffered; None while not connected)
+        self.pipe_fd: Optional[int] = None
+        # Frame pacing waits on this poller, so a reader hang-up (POLLERR on a
+        # FIFO's write end) is noticed within a frame instead of at the next write
+        self._poller = select.poll()
+        # Encoded messages waiting for room in the pipe (see _collapse_backlog)
+        self._backlog: List[bytes] = []
+        self._backlog_warned = False  # warned about the current stall already
+        self._backlog_dropped = 0     # superseded events during the current stall
 
         # Pipe retry tracking (for periodic reconnection attempts)
-        self.last_pipe_retry = time.time()
-        self.pipe_retry_interval = 5.0  # Retry opening pipe every 5 seconds if not connected
+        self.last_pipe_retry = now
+        self.pipe_retry_interval = 5 * NS_PER_SEC  # Retry opening pipe every 5 seconds if not connected
+        self._pipe_retry_count = 0  # attempts since the pipe was last connected
 
         # Live config reload: check mappings.json mtime every 3 seconds
-        self.config_check_interval = 3.0
-        self.last_config_check = time.time()
+        self.config_check_interval = 3 * NS_PER_SEC
+        self.last_config_check = now
         self._config_mtime: float = 0.0  # last seen mtime; 0 forces a load on first check
 
-        # Running state
+        # Detector thread: runs detect_pressed back to back and posts the newest
+        # result into a single-slot queue the main loop drains. Inference starts
+        # as soon as a frame arrives instead of waiting out the main loop's
+        # pacing sleep, and pipe writes never wait behind MediaPipe.
+        self._detector_thread: Optional[threading.Thread] = None
+        self._results: "queue.Queue" = queue.Queue(maxsize=1)
+        self._detect_mappings = None  # mappings the detector thread uses (swapped, never mutated)
+        self._mapped_buttons: FrozenSet[str] = frozenset()  # buttons those mappings can press
+
+        # Optional shared-memory landmark feed, written by the detector thread
+        self.enable_shm_publish = enable_shm_publish
+        self._landmark_publisher = None
+
+        # Running state; `ready` is set once run() has initialized the detector and mapping
         self.running = False
+        self.ready = threading.Event()
 
         # Camera availability flag
         self.camera_available = False
@@ -95,8 +196,9 @@ class VisionSensor:
             # Verify camera is accessible
             if self.gesture_detector.is_active():
                 logger.info("Vision Sensor initialized successfully (using shared instances)")
-                logger.info(f"Active mappings: {self.gesture_mapping.get_active_mappings()}")
+                logger.info(f"Active mappings: {dict(self.gesture_mapping.get_active_mappings())}")
                 thresholds = self.gesture_mapping.get_thresholds()
+                self._apply_thresholds(thresholds)
                 logger.info(f"Thresholds: {thresholds}")
                 self.camera_available = True
                 return
@@ -112,20 +214,21 @@ class VisionSensor:
         for attempt in range(max_retries):
             try:
                 logger.info(f"Initializing GestureDetector (attempt {attempt + 1}/{max_retries})...")
-                self.gesture_detector = GestureDetector(camera_index=self.camera_index)
+                self.gesture_detector = GestureDetector(
+                    camera_index=self.camera_index,
+                    min_tracking_confidence=self.min_tracking_confidence,
+                    inference_size=self.inference_size
+                )
 
                 logger.info("Loading GestureMapping configuration...")
                 self.gesture_mapping = GestureMapping()
 
                 # Apply thresholds from configuration
                 thresholds = self.gesture_mapping.get_thresholds()
-                self.gesture_detector.update_thresholds(
-                    thresholds['delta_threshold'],
-                    thresholds['raise_minimum']
-                )
+                self._apply_thresholds(thresholds)
 
                 logger.info("Vision Sensor initialized successfully")
-                logger.info(f"Active mappings: {self.gesture_mapping.get_active_mappings()}")
+                logger.info(f"Active mappings: {dict(self.gesture_mapping.get_active_mappings())}")
                 logger.info(f"Thresholds: {thresholds}")
                 self.camera_available = True
                 return
@@ -177,16 +280,13 @@ class VisionSensor:
                 if verbose or attempt == 0:
                     logger.info(f"Opening Named Pipe: {self.pipe_path} (attempt {attempt + 1}/{max_retries})")
 
-                # Check if pipe exists
-                if not os.path.exists(self.pipe_path):
-                    raise FileNotFoundError(f"Named Pipe not found: {self.pipe_path}")
-
-                # Open pipe in non-blocking mode to avoid hanging
-                import fcntl
+                # Open pipe in non-blocking mode to avoid hanging, and keep it
+                # that way so a full pipe never blocks a write (see
+                # _write_messages). A missing pipe raises FileNotFoundError
+                # (ENOENT) straight from open().
                 fd = os.open(self.pipe_path, os.O_WRONLY | os.O_NONBLOCK)
-                # Convert to blocking mode after successful open
-                fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) & ~os.O_NONBLOCK)
-                self.pipe = os.fdopen(fd, 'w')
+                self.pipe_fd = fd
+                self._poller.register(fd, select.POLLERR | select.POLLHUP)
 
                 logger.info("Named Pipe opened successfully")
                 return
@@ -198,7 +298,7 @@ class VisionSensor:
                     time.sleep(retry_delay)
                 else:
                     logger.warning("Named Pipe not found - Vision Sensor will continue without pipe output")
-                    self.pipe = None
+                    self.pipe_fd = None
                     return
             except (OSError, BlockingIOError) as e:
                 # Pipe reader not ready (EAGAIN/EWOULDBLOCK)
@@ -208,7 +308,7 @@ class VisionSensor:
                     time.sleep(retry_delay)
                 else:
                     logger.warning("Failed to connect to pipe reader - Vision Sensor will continue without pipe output")
-                    self.pipe = None
+                    self.pipe_fd = None
                     return
             except Exception as e:
                 logger.error(f"Failed to open Named Pipe: {e}")
@@ -217,9 +317,21 @@ class VisionSensor:
                     time.sleep(retry_delay)
                 else:
                     logger.warning("Could not open Named Pipe - Vision Sensor will continue without pipe output")
-                    self.pipe = None
+                    self.pipe_fd = None
                     return
 
+    def _close_pipe(self):
+        """Close the pipe descriptor and stop polling it."""
+        fd, self.pipe_fd = self.pipe_fd, None
+        self._backlog = []  # meant for the reader that just went away
+        if fd is None:
+            return
+        try:
+            self._poller.unregister(fd)
+        except KeyError:
+            pass
+        os.close(fd)
+
     def write_button_event(self, button_name: str, action: str) -> bool:
         """
         Write button event to Named Pipe following Hardware Producer protocol.
@@ -236,26 +348,49 @@ class VisionSensor:
         Returns:
             True if write successful, False otherwise
         """
-        if self.pipe is None:
+        return self.write_button_events([(button_name, action)])
+
+    def write_button_events(self, events: List[Tuple[str, str]]) -> bool:
+        """
+        Write several button events to the Named Pipe, batched into as few
+        system calls as possible.
+
+        Messages still waiting in the backlog go out first, in order. If the
+        pipe is full (reader stalled), the rest are kept in the backlog and
+        sent with the next write instead of blocking the caller.
+
+        Args:
+            events: List of (button_name, action) tuples (may be empty, which
+                    just retries the backlog)
+
+        Returns:
+            True if all events were written or queued, False otherwise
+        """
+        if self.pipe_fd is None:
             logger.warning("Pipe not open, cannot write event")
             return False
 
+        messages = [_event_message(button_name, action) for button_name, action in events]
+        if self._backlog:
+            messages = self._backlog + messages
+            self._backlog = []
+
         try:
-            message = f"{button_name}\n{action}\n\n"
-            self.pipe.write(message)
-            self.pipe.flush()
-            logger.debug(f"Wrote event: {button_name} {action}")
+            self._write_messages(messages)
+            if logger.isEnabledFor(logging.DEBUG):
+                for button_name, action in events:
+                    logger.debug("Wrote event: %s %s", button_name, action)
             return True
 
         except BrokenPipeError:
             logger.error("Broken pipe - reader may have disconnected")
             try:
                 logger.info("Attempting to reopen pipe...")
-                self.pipe.close()
-                self.pipe = None
+                self._close_pipe()
                 self.open_pipe()
-                self.pipe.write(message)
-                self.pipe.flush()
+                if self.pipe_fd is None:
+                    raise OSError("pipe could not be reopened")
+                self._write_messages(messages)
                 logger.info("Pipe reopened and write successful")
                 return True
             except Exception as reopen_error:
@@ -268,6 +403,45 @@ class VisionSensor:
             logger.error(f"Failed to write to pipe: {e}")
             return False
 
+    def _write_messages(self, messages: List[bytes]):
+        """
+        Write encoded messages to the pipe, deferring what doesn't fit.
+
+        Messages are grouped into os.writev() calls of at most PIPE_BUF bytes.
+        The kernel applies each such write atomically (all or nothing, even
+        non-blocking), so messages never interleave with the other pipe
+        writers and are never split. When the pipe is full, the unwritten
+        messages go to the backlog, collapsed to the latest one per button.
+
+        Args:
+            messages: Encoded messages, in send order
+        """
+        fd = self.pipe_fd
+        start = 0
+        count = len(messages)
+        while start < count:
+            end, size = start, 0
+            while end < count and size + len(messages[end]) <= select.PIPE_BUF:
+                size += len(messages[end])
+                end += 1
+            end = max(end, start + 1)  # a lone message over PIPE_BUF goes out alone
+            try:
+                os.writev(fd, messages[start:end])
+            except BlockingIOError:
+                if not self._backlog_warned:
+                    logger.warning("Pipe reader is not keeping up - queueing events")
+                    self._backlog_warned = True
+                pending = messages[start:]
+                self._backlog = _collapse_backlog(pending)
+                self._backlog_dropped += len(pending) - len(self._backlog)
+                return
+            start = end
+
+        if self._backlog_warned:
+            logger.info("Pipe reader caught up (%d superseded event(s) dropped)", self._backlog_dropped)
+            self._backlog_warned = False
+            self._backlog_dropped = 0
+
     def write_button_event_with_retry(self, button_name: str, action: str,
                                      max_retries: int = 3) -> bool:
         """
@@ -278,21 +452,35 @@ class VisionSensor:
             action: 'press' or 'release'
             max_retries: Maximum number of retry attempts
 
+        Returns:
+            True if write successful, False otherwise
+        """
+        return self.write_button_events_with_retry([(button_name, action)], max_retries)
+
+    def write_button_events_with_retry(self, events: List[Tuple[str, str]],
+                                       max_retries: int = 3) -> bool:
+        """
+        Write a batch of button events with retry logic.
+
+        Args:
+            events: List of (button_name, action) tuples
+            max_retries: Maximum number of retry attempts
+
         Returns:
             True if write successful, False otherwise
         """
         for attempt in range(max_retries):
-            if self.write_button_event(button_name, action):
+            if self.write_button_events(events):
                 return True
 
             if attempt < max_retries - 1:
-                logger.warning(f"Retry {attempt + 1}/{max_retries} for {button_name} {action}")
+                logger.warning("Retry %d/%d for %s", attempt + 1, max_retries, _describe(events))
                 time.sleep(0.01)
 
-        logger.error(f"Failed to write event after {max_retries} attempts: {button_name} {action}")
+        logger.error("Failed to write event after %d attempts: %s", max_retries, _describe(events))
         return False
 
-    def process_gesture_events(self, detected_events: list):
+    def process_gesture_events(self, pressed: Optional[FrozenSet[str]]):
         """
         Apply debounce filtering then emit press/release events on confirmed state changes.
 
@@ -300,39 +488,75 @@ class VisionSensor:
         where the gesture is detected. A release is emitted only after
         DEBOUNCE_RELEASE_FRAMES consecutive frames where it is absent.
         This eliminates rapid-fire toggling caused by per-frame MediaPipe jitter.
+        When several gestures map to the same button, the button counts as
+        detected if any of them is.
 
         Args:
-            detected_events: List of (button_name, action) tuples from gesture detector
-                             where action is 'press' (detected this frame) or 'release' (not detected)
+            pressed: Buttons detected this frame, from GestureDetector.detect_pressed(),
+                     or None if no pose was found; every other mapped button is
+                     treated as not detected
         """
-        for button_name, action in detected_events:
-            if action == 'press':
-                # Increment press counter, reset release counter
-                self._debounce_press[button_name] = self._debounce_press.get(button_name, 0) + 1
-                self._debounce_release[button_name] = 0
-
-                # Emit press only when we have enough consecutive detected frames
-                # and the button isn't already in pressed state
-                if (self._debounce_press[button_name] >= DEBOUNCE_PRESS_FRAMES
-                        and button_name not in self._debounced_pressed):
-                    self._debounced_pressed.add(button_name)
-                    self.write_button_event_with_retry(button_name, 'press')
-                    logger.info(f"Gesture activated: {button_name} "
-                                f"(confirmed over {DEBOUNCE_PRESS_FRAMES} frames)")
-
-            else:  # 'release'
-                # Increment release counter, reset press counter
-                self._debounce_release[button_name] = self._debounce_release.get(button_name, 0) + 1
-                self._debounce_press[button_name] = 0
-
-                # Emit release only when we have enough consecutive absent frames
-                # and the button is currently in pressed state
-                if (self._debounce_release[button_name] >= DEBOUNCE_RELEASE_FRAMES
-                        and button_name in self._debounced_pressed):
-                    self._debounced_pressed.discard(button_name)
-                    self.write_button_event_with_retry(button_name, 'release')
-                    logger.info(f"Gesture deactivated: {button_name} "
-                                f"(absent for {DEBOUNCE_RELEASE_FRAMES} frames)")
+        if pressed is None:
+            return  # no pose this frame: leave every counter where it is
+
+        # Steady state: same buttons as the last update and all of them already
+        # confirmed, so no transition can be pending. Extending the streaks
+        # would change nothing observable: a counter is only read after a
+        # frame that changes its button's state, and that frame rebuilds it.
+        if pressed == self._last_pressed and pressed == self._debounced_pressed:
+            return
+        self._last_pressed = pressed
+
+        active = pressed
+        inactive = self._mapped_buttons - pressed
+
+        # Extend each button's current streak; a button's other counter resets
+        # simply by being left out of the rebuilt dict
+        press_counts = self._debounce_press
+        release_counts = self._debounce_release
+        self._debounce_press = {b: press_counts.get(b, 0) + 1 for b in active}
+        self._debounce_release = {b: release_counts.get(b, 0) + 1 for b in inactive}
+
+        # Confirmed state changes this frame, sent together in one write
+        pending = []
+
+        # Emit press only when we have enough consecutive detected frames
+        # and the button isn't already in pressed state
+        for button_name in active - self._debounced_pressed:
+            if self._debounce_press[button_name] >= DEBOUNCE_PRESS_FRAMES:
+                self._debounced_pressed.add(button_name)
+                pending.append((button_name, 'press'))
+
+        # Emit release only when we have enough consecutive absent frames
+        # and the button is currently in pressed state
+        for button_name in inactive & self._debounced_pressed:
+            if self._debounce_release[button_name] >= DEBOUNCE_RELEASE_FRAMES:
+                self._debounced_pressed.discard(button_name)
+                pending.append((button_name, 'release'))
+
+        if pending:
+            # One line for all of this frame's confirmed changes
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Gestures confirmed: %s (press after %d frames, release after %d)",
+                            _describe(pending), DEBOUNCE_PRESS_FRAMES, DEBOUNCE_RELEASE_FRAMES)
+            self.write_button_events_with_retry(pending)
+
+    def _release_pressed(self):
+        """Release every confirmed-pressed button in one batched pipe write."""
+        if not self._debounced_pressed:
+            return
+        self.write_button_events_with_retry(
+            [(button_name, 'release') for button_name in self._debounced_pressed]
+        )
+        self._debounced_pressed.clear()
+
+    def _apply_thresholds(self, thresholds: Mapping[str, float]):
+        """Push configured thresholds to the gesture detector."""
+        self.gesture_detector.update_thresholds(
+            thresholds['delta_threshold'],
+            thresholds['raise_minimum'],
+            motion_min=thresholds['motion_minimum']
+        )
 
     def _reload_config_if_changed(self):
         """
@@ -357,49 +581,52 @@ class VisionSensor:
             thresholds = self.gesture_mapping.get_thresholds()
 
             if self.gesture_detector:
-                self.gesture_detector.update_thresholds(
-                    thresholds['delta_threshold'],
-                    thresholds['raise_minimum']
-                )
+                self._apply_thresholds(thresholds)
 
             # Reset debounce state — stale counters from old mappings are invalid
             self._debounce_press.clear()
             self._debounce_release.clear()
+            self._last_pressed = None
 
             # Release any buttons that were held under the old config
-            for button_name in list(self._debounced_pressed):
-                self.write_button_event_with_retry(button_name, 'release')
-            self._debounced_pressed.clear()
+            self._release_pressed()
 
             self._config_mtime = mtime
             logger.info(
                 f"Config reloaded from {config_path} | "
-                f"mappings={self.gesture_mapping.get_active_mappings()} | "
+                f"mappings={dict(self.gesture_mapping.get_active_mappings())} | "
                 f"thresholds={thresholds}"
             )
 
         except Exception as e:
             logger.warning(f"Config reload failed: {e}")
 
-    def log_fps(self):
-        """Log FPS statistics periodically with warnings for low performance."""
-        current_time = time.time()
+    def log_fps(self, current_time: Optional[int] = None):
+        """
+        Log FPS statistics periodically with warnings for low performance.
 
-        if current_time - self.last_fps_log >= 5.0:
+        Args:
+            current_time: The caller's time.monotonic_ns() timestamp for this
+                          frame, if it has one (read here otherwise)
+        """
+        if current_time is None:
+            current_time = time.monotonic_ns()
+
+        if current_time - self.last_fps_log >= self.fps_log_interval:
             elapsed = current_time - self.start_time
-            fps = self.frame_count / elapsed if elapsed > 0 else 0
+            fps = self.frame_count * NS_PER_SEC / elapsed if elapsed > 0 else 0
 
-            logger.info(f"FPS: {fps:.1f} | Frames processed: {self.frame_count}")
+            logger.info("FPS: %.1f | Frames processed: %d", fps, self.frame_count)
 
             if fps < 15:
                 logger.warning(
-                    f"Low FPS detected: {fps:.1f} (target: 30+). "
-                    "Consider reducing camera resolution or closing other applications."
+                    "Low FPS detected: %.1f (target: 30+). "
+                    "Consider reducing camera resolution or closing other applications.", fps
                 )
             elif fps < 25:
                 logger.warning(
-                    f"FPS below target: {fps:.1f} (target: 30+). "
-                    "Performance may be degraded."
+                    "FPS below target: %.1f (target: 30+). "
+                    "Performance may be degraded.", fps
                 )
 
             self.last_fps_log = current_time
@@ -409,8 +636,8 @@ class VisionSensor:
         Main loop: process frames at 30+ FPS and detect gestures.
 
         This is the core processing loop that:
-        1. Captures camera frames
-        2. Detects gestures using MediaPipe
+        1. Captures camera frames (detector thread)
+        2. Detects gestures using MediaPipe (detector thread)
         3. Applies debounce filtering (5-frame confirm/release)
         4. Writes confirmed button events to Named Pipe
         5. Reloads config/mappings.json if modified (every 3s)
@@ -422,16 +649,24 @@ class VisionSensor:
         try:
             # Initialize components
             self.initialize()
+            self.ready.set()
 
             # Open Named Pipe
             self.open_pipe()
 
             mappings = self.gesture_mapping.get_active_mappings()
 
+            # These mappings are current, so only later edits of the file should
+            # count as a reload (which would release held buttons)
+            try:
+                self._config_mtime = os.path.getmtime(self.gesture_mapping.config_file)
+            except OSError:
+                pass
+
             if not mappings:
                 logger.warning("No gesture mappings configured - no gestures will be detected")
             else:
-                logger.info(f"Active gesture mappings: {mappings}")
+                logger.info(f"Active gesture mappings: {dict(mappings)}")
                 logger.info(f"Detection thresholds: {self.gesture_mapping.get_thresholds()}")
 
             if self.camera_available:
@@ -439,79 +674,129 @@ class VisionSensor:
             else:
                 logger.info("Vision Sensor running - camera unavailable, gesture detection disabled")
 
+            # No sleep-based pacing: the detector thread's results (paced by the
+            # camera) drive the loop. One clock read per iteration: `now` is
+            # taken once a frame's result (or the idle wait) is done and also
+            # serves the next iteration's housekeeping checks.
+            now = time.monotonic_ns()
+            last_result = now
+            idle_wait_ms = int(RESULT_WAIT_S * 1000)
+
+            # Bind per-frame callables to locals once (LOAD_FAST instead of
+            # attribute lookups on every frame). The detector and camera state
+            # are fixed for the lifetime of this loop.
+            monotonic_ns = time.monotonic_ns
+            poll = self._poller.poll
+            process_events = self.process_gesture_events
+            log_fps = self.log_fps
+            camera_available = self.camera_available
+            get_result = self._results.get
+
+            self._set_detect_mappings(mappings)
+            use_detector = bool(camera_available and self.gesture_detector)
+            if use_detector:
+                if self.enable_shm_publish:
+                    try:
+                        from core.landmark_shm import LandmarkPublisher
+                        self._landmark_publisher = LandmarkPublisher()
+                    except Exception as e:
+                        logger.warning(f"Shared-memory landmark publishing disabled: {e}")
+                self._detector_thread = threading.Thread(
+                    target=self._detect_loop, name='GestureDetection', daemon=True
+                )
+                self._detector_thread.start()
+
             while self.running:
-                loop_start = time.time()
-                current_time = loop_start
+                # --- Retry events the pipe had no room for ---
+                if self._backlog:
+                    self.write_button_events([])
 
                 # --- Periodic pipe reconnect (single non-blocking attempt) ---
-                if self.pipe is None:
-                    if current_time - self.last_pipe_retry >= self.pipe_retry_interval:
-                        if not hasattr(self, '_pipe_retry_count'):
-                            self._pipe_retry_count = 0
+                if self.pipe_fd is None:
+                    if now - self.last_pipe_retry >= self.pipe_retry_interval:
                         self._pipe_retry_count += 1
 
                         if self._pipe_retry_count == 1:
                             logger.info("Pipe not connected, attempting periodic reconnection...")
                         else:
-                            logger.debug(f"Retrying pipe connection (attempt {self._pipe_retry_count})...")
+                            logger.debug("Retrying pipe connection (attempt %d)...", self._pipe_retry_count)
 
                         self.open_pipe(verbose=False, max_retries=1)
-                        self.last_pipe_retry = current_time
-                        if self.pipe is not None:
+                        self.last_pipe_retry = now
+                        if self.pipe_fd is not None:
                             logger.info("✓ Pipe reconnected successfully!")
                             self._pipe_retry_count = 0
 
                 # --- Live config reload (every 3 seconds) ---
-                if current_time - self.last_config_check >= self.config_check_interval:
+                if now - self.last_config_check >= self.config_check_interval:
                     self._reload_config_if_changed()
-                    # Always refresh mappings from gesture_mapping (handles reload + no-op)
+                    # Pick up mappings changed by a reload or by another user of
+                    # a shared GestureMapping; unchanged ones keep their
+                    # precomputed state
                     mappings = self.gesture_mapping.get_active_mappings()
-                    self.last_config_check = current_time
-
-                # --- Gesture detection and debounce ---
-                if self.camera_available and self.gesture_detector:
-                    detected_events = self.gesture_detector.detect_gestures(mappings)
-                    self.process_gesture_events(detected_events)
-                else:
-                    # Camera not available — release any held buttons
-                    for button_name in list(self._debounced_pressed):
-                        self.write_button_event_with_retry(button_name, 'release')
-                    self._debounced_pressed.clear()
-                    self._debounce_press.clear()
-                    self._debounce_release.clear()
-
-                # --- Frame accounting and FPS logging ---
-                self.frame_count += 1
-                if self.camera_available:
-                    self.log_fps()
-
-                # --- Frame pacing (target 30 FPS) ---
-                loop_time = time.time() - loop_start
-                target_frame_time = 1.0 / 30.0
-                sleep_time = target_frame_time - loop_time
-
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                elif loop_time > target_frame_time * 1.5 and self.camera_available:
-                    self.slow_frame_count += 1
-                    self.slow_frame_times.append(loop_time * 1000)
-
-                    if time.time() - self.last_slow_frame_log >= self.slow_frame_log_interval:
-                        if self.slow_frame_count > 0:
-                            avg = sum(self.slow_frame_times) / len(self.slow_frame_times)
+                    if mappings != self._detect_mappings:
+                        self._set_detect_mappings(mappings)
+                    self.last_config_check = now
+
+                if use_detector:
+                    # --- Debounce the detector thread's newest result ---
+                    try:
+                        pressed = get_result(timeout=RESULT_WAIT_S)
+                    except queue.Empty:
+                        now = monotonic_ns()
+                        continue  # no new frame yet; loop back for housekeeping
+                    if isinstance(pressed, Exception):
+                        raise pressed  # detector thread failed
+                    process_events(pressed)
+
+                    # --- Frame accounting and FPS logging ---
+                    now = monotonic_ns()
+                    self.frame_count += 1
+                    log_fps(now)
+
+                    # Notice a reader hang-up between frames (non-blocking check)
+                    if self.pipe_fd is not None and poll(0):
+                        logger.warning("Pipe reader disconnected - will reconnect")
+                        self._close_pipe()
+                        self.last_pipe_retry = now - self.pipe_retry_interval  # retry next frame
+
+                    # --- Slow frame tracking (time between results) ---
+                    frame_time = now - last_result
+                    last_result = now
+                    if frame_time > FRAME_INTERVAL_NS * 3 // 2:
+                        self.slow_frame_count += 1
+                        self.slow_frame_time_sum += frame_time
+                        if frame_time > self.slow_frame_time_max:
+                            self.slow_frame_time_max = frame_time
+
+                        if now - self.last_slow_frame_log >= self.slow_frame_log_interval:
+                            avg = self.slow_frame_time_sum / self.slow_frame_count / 1_000_000
                             logger.warning(
-                                f"Performance: {self.slow_frame_count} slow frames in last "
-                                f"{self.slow_frame_log_interval:.0f}s | "
-                                f"Avg: {avg:.1f}ms | "
-                                f"Max: {max(self.slow_frame_times):.1f}ms | "
-                                f"Target: {target_frame_time*1000:.1f}ms"
+                                "Performance: %d slow frames in last %.0fs | "
+                                "Avg: %.1fms | Max: %.1fms | Target: %.1fms",
+                                self.slow_frame_count, self.slow_frame_log_interval / NS_PER_SEC,
+                                avg, self.slow_frame_time_max / 1_000_000, FRAME_INTERVAL_NS / 1_000_000
                             )
                             self.slow_frame_count = 0
-                            self.slow_frame_times = []
-                            self.last_slow_frame_log = time.time()
-
-        except KeyboardInterrupt:
-            logger.info("Vision Sensor interrupted by user")
+                            self.slow_frame_time_sum = 0
+                            self.slow_frame_time_max = 0
+                            self.last_slow_frame_log = now
+                    continue
+
+                # --- Camera not available — release any held buttons ---
+                self._release_pressed()
+                self._debounce_press.clear()
+                self._debounce_release.clear()
+                self._last_pressed = None
+
+                # No frames to pace: wait for the next housekeeping pass by
+                # polling the pipe, which returns early if the reader goes away
+                hung_up = poll(idle_wait_ms)
+                now = monotonic_ns()
+                if hung_up:
+                    logger.warning("Pipe reader disconnected - will reconnect")
+                    self._close_pipe()
+                    self.last_pipe_retry = now - self.pipe_retry_interval  # retry next pass
 
         except Exception as e:
             logger.error(f"Vision Sensor error: {e}", exc_info=True)
@@ -520,6 +805,78 @@ class VisionSensor:
         finally:
             self.cleanup()
 
+    def _detect_loop(self):
+        """
+        Detector thread: run gesture detection back to back and publish results.
+
+        detect_pressed() blocks until the camera delivers a new frame, so this
+        runs at the camera's frame rate. Only the newest result is kept; if the
+        main loop hasn't taken the previous one yet, it is replaced.
+        """
+        if self.enable_realtime:
+            self._make_realtime()
+
+        detect = self.gesture_detector.detect_pressed
+        get_landmarks = self.gesture_detector.get_landmark_array
+        publish = self._landmark_publisher.publish if self._landmark_publisher else None
+        results = self._results
+        while self.running:
+            try:
+                pressed = detect(self._detect_mappings)
+                if publish is not None and pressed is not None:
+                    publish(get_landmarks())
+            except Exception as e:
+                # Hand the failure to the main loop, which owns error handling
+                pressed = e
+            try:
+                results.put_nowait(pressed)
+            except queue.Full:
+                try:
+                    results.get_nowait()
+                except queue.Empty:
+                    pass  # main loop just took it
+                results.put_nowait(pressed)
+            if isinstance(pressed, Exception):
+                return
+
+    def _make_realtime(self):
+        """
+        Pin the calling (detector) thread and move it to SCHED_FIFO.
+
+        Best effort: unsupported platforms and missing privileges just keep
+        the default scheduling.
+        """
+        if not hasattr(os, 'sched_setscheduler'):
+            logger.info("Realtime scheduling not supported on this platform")
+            return
+        # pid 0 is the calling thread on Linux
+        if self.inference_core is not None:
+            try:
+                os.sched_setaffinity(0, {self.inference_core})
+                logger.info("Detector thread pinned to CPU %d", self.inference_core)
+            except OSError as e:
+                logger.info(f"Could not pin detector thread to CPU {self.inference_core}: {e}")
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(REALTIME_PRIORITY))
+            logger.info("Detector thread running under SCHED_FIFO (priority %d)", REALTIME_PRIORITY)
+        except OSError as e:
+            logger.info(f"Realtime scheduling unavailable, using default: {e}")
+
+    def _set_detect_mappings(self, mappings):
+        """
+        Hand a mapping set to the detector thread.
+
+        Args:
+            mappings: Read-only view of the active gesture -> button mappings
+        """
+        self._mapped_buttons = frozenset(mappings.values())
+        self._last_pressed = None  # the inactive set may have changed
+        # Encode their pipe messages now rather than on the first gesture
+        for button_name in self._mapped_buttons:
+            _event_message(button_name, 'press')
+            _event_message(button_name, 'release')
+        self._detect_mappings = mappings
+
     def stop(self):
         """Stop the vision sensor loop."""
         logger.info("Stopping Vision Sensor...")
@@ -529,14 +886,26 @@ class VisionSensor:
         """Clean up resources."""
         logger.info("Cleaning up Vision Sensor resources...")
 
-        # Release all confirmed-pressed gestures
-        for button_name in list(self._debounced_pressed):
-            self.write_button_event(button_name, 'release')
+        # Stop the detector thread before the detector is torn down under it
+        self.running = False
+        if self._detector_thread is not None:
+            self._detector_thread.join(timeout=2.0)
+            self._detector_thread = None
+        if self._landmark_publisher is not None:
+            self._landmark_publisher.close()
+            self._landmark_publisher = None
+
+        # Release all confirmed-pressed gestures in one write (no retries on shutdown)
+        if self._debounced_pressed:
+            self.write_button_events(
+                [(button_name, 'release') for button_name in self._debounced_pressed]
+            )
+            self._debounced_pressed.clear()
 
         # Close pipe
-        if self.pipe:
+        if self.pipe_fd is not None:
             try:
-                self.pipe.close()
+                self._close_pipe()
                 logger.info("Named Pipe closed")
             except Exception as e:
                 logger.error(f"Error closing pipe: {e}")
@@ -552,6 +921,17 @@ class VisionSensor:
         logger.info("Vision Sensor cleanup complete")
 
 
+def _parse_size(value: str) -> Tuple[int, int]:
+    """Parse a 'WIDTHxHEIGHT' command-line value, e.g. '320x240'."""
+    import argparse
+
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}")
+    return width, height
+
+
 def main():
     """Entry point for running Vision Sensor standalone."""
     import argparse
@@ -568,10 +948,61 @@ def main():
         default=0,
         help='Camera device index (default: 0)'
     )
+    parser.add_argument(
+        '--min-tracking-confidence',
+        type=float,
+        default=DEFAULT_MIN_TRACKING_CONFIDENCE,
+        help='Pose tracking confidence below which the pose detector re-runs '
+             f'(default: {DEFAULT_MIN_TRACKING_CONFIDENCE})'
+    )
+    parser.add_argument(
+        '--inference-size',
+        type=_parse_size,
+        default=None,
+        metavar='WxH',
+        help='Downscale frames to this size before pose inference, e.g. 320x240 '
+             '(default: full captured frame)'
+    )
+    parser.add_argument(
+        '--realtime',
+        action='store_true',
+        help='Run gesture detection under SCHED_FIFO (needs root or CAP_SYS_NICE)'
+    )
+    parser.add_argument(
+        '--inference-core',
+        type=int,
+        default=None,
+        help='With --realtime, pin gesture detection to this CPU'
+    )
+    parser.add_argument(
+        '--shm-publish',
+        action='store_true',
+        help='Publish pose landmarks to shared memory for debug consumers'
+    )
 
     args = parser.parse_args()
 
-    sensor = VisionSensor(pipe_path=args.pipe, camera_index=args.camera)
+    # Configure logging here rather than at import, so embedders that import
+    # VisionSensor keep their own logging setup. Records are only queued by
+    # the logging thread; a listener thread writes them to the terminal, so a
+    # slow stream can't stall a frame.
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, console_handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # console_handler adds the rest
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    log_listener.start()
+
+    sensor = VisionSensor(pipe_path=args.pipe, camera_index=args.camera,
+                          min_tracking_confidence=args.min_tracking_confidence,
+                          enable_shm_publish=args.shm_publish,
+                          inference_size=args.inference_size,
+                          enable_realtime=args.realtime,
+                          inference_core=args.inference_core)
 
     try:
         sensor.run()
@@ -579,6 +1010,7 @@ def main():
         logger.info("Shutting down...")
     finally:
         sensor.stop()
+        log_listener.stop()  # flushes queued records
 
 
 if __name__ == '__main__':
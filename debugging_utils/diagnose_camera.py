@@ -10,41 +10,95 @@ This script helps diagnose USB camera detection issues by checking:
 5. Camera capabilities
 """
 
+import argparse
+import grp
+import hashlib
+import json
 import os
+import re
+import stat
 import sys
 import subprocess
-import cv2
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from v4l2py import Device  # optional: query V4L2 in-process instead of running v4l2-ctl
+except ImportError:
+    Device = None
+
+
+MAX_PROBE_WORKERS = 8  # Pi 5 exposes many ISP nodes beside the camera
+PROBE_TIMEOUT_MS = 500  # per-index OpenCV open/read timeout
+_SEP = "=" * 60
+
 
 def print_section(title):
-    """Print a formatted section header."""
-    print("\n" + "=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
+    """Print a formatted section header, first writing out the previous section."""
+    sys.stdout.flush()
+    print(f"\n{_SEP}\n  {title}\n{_SEP}")
 
 
-def check_usb_devices():
-    """Check USB devices connected to the system."""
-    print_section("USB Devices")
+def start_probe(cmd):
+    """Start a diagnostic command without waiting for it to finish."""
     try:
-        result = subprocess.run(
-            ['lsusb'],
-            capture_output=True,
-            text=True,
-            check=True
+        return subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
         )
-        print(result.stdout)
-        
-        if 'camera' in result.stdout.lower() or 'video' in result.stdout.lower():
-            print("\n✓ Camera-related USB device detected")
-        else:
-            print("\n⚠ No obvious camera device found in USB list")
-            print("  (This doesn't mean there's no camera - check video devices)")
-    except subprocess.CalledProcessError as e:
-        print(f"Error running lsusb: {e}")
     except FileNotFoundError:
+        return None
+
+
+def collect_probe(proc):
+    """Wait for a probe started by start_probe() and return its result.
+
+    Returns None if the command isn't installed.
+    """
+    if proc is None:
+        return None
+    stdout, stderr = proc.communicate()
+    return subprocess.CompletedProcess(proc.args, proc.returncode, stdout, stderr)
+
+
+def check_usb_devices(result):
+    """Check USB devices connected to the system from captured lsusb output."""
+    print_section("USB Devices")
+    if result is None:
         print("lsusb not found - install with: sudo apt-get install usbutils")
+        return
+    if result.returncode != 0:
+        print(f"Error running lsusb: exit status {result.returncode}")
+        return
+
+    print(result.stdout)
+    
+    if 'camera' in result.stdout.lower() or 'video' in result.stdout.lower():
+        print("\n✓ Camera-related USB device detected")
+    else:
+        print("\n⚠ No obvious camera device found in USB list")
+        print("  (This doesn't mean there's no camera - check video devices)")
+
+
+def _mode_allows(stat_info, user_bit, group_bit, other_bit):
+    """Decide access from a stat result's mode bits, as the kernel would for us."""
+    if os.geteuid() == 0:
+        return True
+    if stat_info.st_uid == os.geteuid():
+        return bool(stat_info.st_mode & user_bit)
+    if stat_info.st_gid == os.getegid() or stat_info.st_gid in os.getgroups():
+        return bool(stat_info.st_mode & group_bit)
+    return bool(stat_info.st_mode & other_bit)
+
+
+def list_video_nodes():
+    """List /dev/videoN entries in numeric order with one directory read."""
+    with os.scandir('/dev') as it:
+        entries = [e for e in it if e.name.startswith('video') and e.name[5:].isdigit()]
+    entries.sort(key=lambda e: int(e.name[5:]))
+    return entries
 
 
 def check_video_devices():
@@ -52,26 +106,25 @@ def check_video_devices():
     print_section("Video Device Nodes")
     
     video_devices = []
-    for i in range(10):  # Check /dev/video0 through /dev/video9
-        dev_path = f"/dev/video{i}"
-        if os.path.exists(dev_path):
-            video_devices.append(dev_path)
-            # Check permissions
-            stat_info = os.stat(dev_path)
-            mode = oct(stat_info.st_mode)[-3:]
-            print(f"  {dev_path} - Mode: {mode}")
-            
-            # Check if readable
-            if os.access(dev_path, os.R_OK):
-                print(f"    ✓ Readable")
-            else:
-                print(f"    ✗ NOT readable (permission issue)")
-            
-            # Check if writable
-            if os.access(dev_path, os.W_OK):
-                print(f"    ✓ Writable")
-            else:
-                print(f"    ✗ NOT writable (may need to add user to video group)")
+    for entry in list_video_nodes():
+        dev_path = entry.path
+        video_devices.append(dev_path)
+        # Check permissions
+        stat_info = entry.stat()
+        mode = oct(stat_info.st_mode)[-3:]
+        print(f"  {dev_path} - Mode: {mode}")
+        
+        # Check if readable
+        if _mode_allows(stat_info, stat.S_IRUSR, stat.S_IRGRP, stat.S_IROTH):
+            print(f"    ✓ Readable")
+        else:
+            print(f"    ✗ NOT readable (permission issue)")
+        
+        # Check if writable
+        if _mode_allows(stat_info, stat.S_IWUSR, stat.S_IWGRP, stat.S_IWOTH):
+            print(f"    ✓ Writable")
+        else:
+            print(f"    ✗ NOT writable (may need to add user to video group)")
     
     if not video_devices:
         print("  ✗ No video devices found in /dev/video*")
@@ -86,8 +139,15 @@ def check_video_devices():
 
 
 def check_v4l2_info(device_path):
-    """Get detailed information about a video device using v4l2-ctl."""
+    """Get detailed information about a video device via v4l2py, or v4l2-ctl if it isn't installed."""
     print_section(f"V4L2 Info for {device_path}")
+    if Device is not None:
+        try:
+            with Device(device_path) as dev:
+                print(dev.info)
+            return
+        except Exception as e:
+            print(f"v4l2py query failed ({e}), falling back to v4l2-ctl")
     try:
         result = subprocess.run(
             ['v4l2-ctl', '--device', device_path, '--all'],
@@ -103,36 +163,72 @@ def check_v4l2_info(device_path):
         print("v4l2-ctl not found - install with: sudo apt-get install v4l-utils")
 
 
-def check_opencv_cameras():
-    """Test OpenCV camera access for multiple indices."""
+def probe_opencv_camera(index):
+    """Open one camera index with OpenCV and try to read a frame.
+
+    Returns:
+        (index, opened, (width, height, backend, fps) or None if no frame was read)
+    """
+    import cv2
+    cap = cv2.VideoCapture()
+    cap.setExceptionMode(False)
+    timeouts = []
+    if hasattr(cv2, 'CAP_PROP_OPEN_TIMEOUT_MSEC'):
+        timeouts = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, PROBE_TIMEOUT_MS,
+                    cv2.CAP_PROP_READ_TIMEOUT_MSEC, PROBE_TIMEOUT_MS]
+    try:
+        try:
+            # Bound how long a dead node can stall the probe
+            cap.open(index, cv2.CAP_V4L2, timeouts)
+        except (cv2.error, TypeError):
+            # Older builds reject the timeout parameters; probe without them
+            cap.open(index, cv2.CAP_V4L2)
+        if not cap.isOpened():
+            return index, False, None
+        ret, frame = cap.read()
+        if not ret or frame is None:
+            return index, True, None
+        height, width = frame.shape[:2]
+        return index, True, (width, height, cap.getBackendName(), cap.get(cv2.CAP_PROP_FPS))
+    finally:
+        cap.release()
+
+
+def check_opencv_cameras(video_devices):
+    """Test OpenCV camera access for the indices that have a /dev/videoN node.
+
+    Args:
+        video_devices: Device paths found by check_video_devices()
+    """
     print_section("OpenCV Camera Detection")
     
+    indices = [int(re.match(r'/dev/video(\d+)$', d).group(1)) for d in video_devices]
+    if not indices:
+        # Nothing for OpenCV to open; skip loading it at all
+        print("  ✗ Skipped - no /dev/video* devices")
+        return []
+    
+    print(f"Testing camera indices {', '.join(map(str, indices))}...", flush=True)
+    
+    # Probe all indices at once: a slow index can block on the V4L2 open
+    # timeout, and OpenCV releases the GIL while it waits.
+    with ThreadPoolExecutor(max_workers=min(len(indices), MAX_PROBE_WORKERS)) as pool:
+        results = list(pool.map(probe_opencv_camera, indices))
+    
     available_cameras = []
     
-    for i in range(5):  # Check camera indices 0-4
-        print(f"\nTesting camera index {i}...")
-        cap = cv2.VideoCapture(i)
-        
-        if cap.isOpened():
-            # Try to read a frame to confirm it's working
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                height, width = frame.shape[:2]
-                print(f"  ✓ Camera {i} is OPEN and working")
-                print(f"    Resolution: {width}x{height}")
-                
-                # Get backend info
-                backend = cap.getBackendName()
-                print(f"    Backend: {backend}")
-                
-                # Get some properties
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                print(f"    FPS: {fps}")
-                
-                available_cameras.append(i)
-            else:
-                print(f"  ⚠ Camera {i} opened but cannot read frames")
-            cap.release()
+    for i, opened, info in results:
+        print(f"\nCamera index {i}:")
+        if info is not None:
+            width, height, backend, fps = info
+            print(f"  ✓ Camera {i} is OPEN and working")
+            print(f"    Resolution: {width}x{height}")
+            print(f"    Backend: {backend}")
+            print(f"    FPS: {fps}")
+            
+            available_cameras.append(i)
+        elif opened:
+            print(f"  ⚠ Camera {i} opened but cannot read frames")
         else:
             print(f"  ✗ Camera {i} cannot be opened")
     
@@ -149,6 +245,14 @@ def check_opencv_cameras():
     return available_cameras
 
 
+def _group_name(gid):
+    """Name for a group id, or the id itself if it has no group entry."""
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
 def check_user_permissions():
     """Check if user has necessary permissions."""
     print_section("User Permissions")
@@ -156,25 +260,45 @@ def check_user_permissions():
     user = os.environ.get('USER', 'unknown')
     print(f"Current user: {user}")
     
-    # Check groups
-    try:
-        result = subprocess.run(
-            ['groups'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        groups = result.stdout.strip().split()
-        print(f"User groups: {', '.join(groups)}")
-        
-        if 'video' in groups:
-            print("  ✓ User is in 'video' group (good for camera access)")
-        else:
-            print("  ✗ User is NOT in 'video' group")
-            print("    Fix with: sudo usermod -a -G video $USER")
-            print("    Then log out and log back in")
-    except Exception as e:
-        print(f"Error checking groups: {e}")
+    # Check groups (the same list `groups` prints, without forking it)
+    gids = [os.getegid()] + [g for g in os.getgroups() if g != os.getegid()]
+    groups = [_group_name(g) for g in gids]
+    print(f"User groups: {', '.join(groups)}")
+    
+    if 'video' in groups:
+        print("  ✓ User is in 'video' group (good for camera access)")
+    else:
+        print("  ✗ User is NOT in 'video' group")
+        print("    Fix with: sudo usermod -a -G video $USER")
+        print("    Then log out and log back in")
+
+
+def find_video_users():
+    """Find processes holding a /dev/video* node open by scanning /proc/*/fd.
+
+    Returns:
+        List of (pid, command name, device path)
+    """
+    users = []
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        fd_dir = f'/proc/{pid}/fd'
+        try:
+            # Processes can exit mid-scan, and other users' fds need root
+            targets = {os.readlink(f'{fd_dir}/{fd}') for fd in os.listdir(fd_dir)}
+        except OSError:
+            continue
+        devices = sorted(t for t in targets if t.startswith('/dev/video'))
+        if not devices:
+            continue
+        try:
+            with open(f'/proc/{pid}/comm') as f:
+                comm = f.read().strip()
+        except OSError:
+            comm = '?'
+        users.extend((int(pid), comm, dev) for dev in devices)
+    return sorted(users)
 
 
 def check_camera_processes():
@@ -182,65 +306,57 @@ def check_camera_processes():
     print_section("Camera Usage by Other Processes")
     
     try:
-        # Check for processes using video devices
-        result = subprocess.run(
-            ['lsof', '/dev/video*'],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0 and result.stdout:
-            print("Processes using video devices:")
-            print(result.stdout)
-        else:
-            print("  ✓ No other processes appear to be using video devices")
-    except FileNotFoundError:
-        print("lsof not found - install with: sudo apt-get install lsof")
-    except Exception as e:
+        users = find_video_users()
+    except OSError as e:
         print(f"Error checking processes: {e}")
+        return
+    
+    if users:
+        print("Processes using video devices:")
+        for pid, comm, dev in users:
+            print(f"  {comm} (PID {pid}) - {dev}")
+    else:
+        print("  ✓ No other processes appear to be using video devices")
 
 
 def check_kernel_modules():
     """Check if necessary kernel modules are loaded."""
     print_section("Kernel Modules")
     
+    # /proc/modules is what lsmod reads; parse it directly instead of forking
     try:
-        result = subprocess.run(
-            ['lsmod'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        modules = result.stdout.lower()
-        relevant_modules = []
-        
-        if 'uvcvideo' in modules:
-            relevant_modules.append('uvcvideo (USB Video Class)')
-        if 'videobuf2' in modules:
-            relevant_modules.append('videobuf2 (Video buffer)')
-        if 'videodev' in modules:
-            relevant_modules.append('videodev (Video device)')
-        
-        if relevant_modules:
-            print("Relevant kernel modules loaded:")
-            for mod in relevant_modules:
-                print(f"  ✓ {mod}")
-        else:
-            print("  ⚠ No obvious video-related modules found")
-            print("  (This may be normal if modules are built into kernel)")
-    except Exception as e:
+        with open('/proc/modules') as f:
+            loaded = {line.split(None, 1)[0] for line in f if line.strip()}
+    except OSError as e:
         print(f"Error checking modules: {e}")
+        return
+    
+    relevant_modules = []
+    
+    if 'uvcvideo' in loaded:
+        relevant_modules.append('uvcvideo (USB Video Class)')
+    if any(name.startswith('videobuf2') for name in loaded):
+        relevant_modules.append('videobuf2 (Video buffer)')
+    if 'videodev' in loaded:
+        relevant_modules.append('videodev (Video device)')
+    
+    if relevant_modules:
+        print("Relevant kernel modules loaded:")
+        for mod in relevant_modules:
+            print(f"  ✓ {mod}")
+    else:
+        print("  ⚠ No obvious video-related modules found")
+        print("  (This may be normal if modules are built into kernel)")
 
 
-def main():
-    """Run all diagnostic checks."""
-    print("\n" + "=" * 60)
-    print("  Raspberry Pi USB Camera Diagnostic Tool")
-    print("=" * 60)
+def run_static_checks():
+    """Run the checks covered by the report cache (see cache_key).
+
+    Returns:
+        List of video device paths
+    """
+    print(f"\n{_SEP}\n  Raspberry Pi USB Camera Diagnostic Tool\n{_SEP}")
     
-    # Run all checks
-    check_usb_devices()
     video_devices = check_video_devices()
     
     if video_devices:
@@ -249,8 +365,21 @@ def main():
     
     check_user_permissions()
     check_kernel_modules()
+    return video_devices
+
+
+def run_live_checks(video_devices, usb_probe):
+    """Run the checks that depend on runtime state; these are never cached.
+
+    Args:
+        video_devices: Video device paths from run_static_checks()
+        usb_probe: lsusb process from start_probe(), started by the caller
+    """
+    # Nothing in the cache key changes when a device is plugged into another
+    # port (nodes appear under /dev/bus/usb/, not /dev), so this is live too
+    check_usb_devices(collect_probe(usb_probe))
     check_camera_processes()
-    available_cameras = check_opencv_cameras()
+    available_cameras = check_opencv_cameras(video_devices)
     
     # Summary
     print_section("Summary & Recommendations")
@@ -270,7 +399,101 @@ def main():
         print("6. Try a different USB port (prefer USB 2.0 ports)")
         print("7. Check dmesg for errors: dmesg | tail -20")
     
-    print("\n" + "=" * 60)
+    print(f"\n{_SEP}")
+
+
+CACHE_PATH = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'playable-pyremote' / 'diag.json'
+
+
+def cache_key():
+    """Describe the system state the cached static sections depend on.
+
+    /proc/modules is hashed rather than stat'ed because procfs mtimes don't
+    change when modules load.
+
+    Returns:
+        A JSON-serializable key, or None if the state can't be read
+    """
+    try:
+        with open('/proc/modules', 'rb') as f:
+            modules = hashlib.sha1(f.read()).hexdigest()
+        return [
+            os.stat(__file__).st_mtime_ns,  # a changed script invalidates old reports
+            os.stat('/sys/class/video4linux').st_mtime_ns,
+            os.stat('/dev').st_mtime_ns,
+            modules,
+            os.environ.get('USER'),
+            sorted(os.getgroups()),
+        ]
+    except OSError:
+        return None
+
+
+class _Tee:
+    """Write to the terminal while keeping a copy of everything written."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def main():
+    """Run all diagnostic checks, replaying the static sections if nothing changed."""
+    parser = argparse.ArgumentParser(description='Raspberry Pi USB camera diagnostics')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the cached report and rerun every check')
+    args = parser.parse_args()
+    
+    # Block-buffer stdout so each section goes out in one write instead of
+    # one per line (noticeable over ssh/serial); print_section flushes.
+    sys.stdout.reconfigure(line_buffering=False)
+    
+    # Start lsusb before the static checks (or the cache replay), so it runs
+    # while they do; run_live_checks() only waits for its output.
+    usb_probe = start_probe(['lsusb'])
+    
+    key = cache_key()
+    video_devices = None
+    if not args.no_cache and key is not None:
+        try:
+            with open(CACHE_PATH) as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                output, video_devices = cached['output'], cached['video_devices']
+                sys.stdout.write(output)
+                print(f"\n(sections above replayed from {CACHE_PATH}; "
+                      f"rerun with --no-cache to refresh)")
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    if video_devices is None:
+        tee = _Tee(sys.stdout)
+        sys.stdout = tee
+        try:
+            video_devices = run_static_checks()
+        finally:
+            sys.stdout = tee.stream
+        
+        if key is not None:
+            try:
+                CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                with open(CACHE_PATH, 'w') as f:
+                    json.dump({'key': key, 'output': ''.join(tee.parts),
+                               'video_devices': video_devices}, f)
+            except OSError as e:
+                print(f"Could not write report cache: {e}")
+    
+    # Who holds the camera and whether it delivers frames can change at any
+    # time, so these sections always run
+    run_live_checks(video_devices, usb_probe)
+    sys.stdout.flush()
 
 
 if __name__ == '__main__':
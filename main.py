@@ -12,17 +12,22 @@ Coordinates all system components:
 This is the single entry point for starting the PlayAble rehabilitation gaming system.
 """
 
+import atexit
 import os
+import queue
 import sys
 import select
+import selectors
 import struct
 import time
 import signal
+import stat
 import logging
 import logging.handlers
 import threading
 import subprocess
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Optional
 from datetime import datetime
 
 # Import core components
@@ -48,10 +53,50 @@ def generate_qr_png():
         logging.getLogger(__name__).warning(f'QR code generation failed: {e}')
 
 
+class BatchedFileHandler(logging.handlers.MemoryHandler):
+    """
+    Buffer records for a FileHandler and write each batch with a single write().
+
+    FileHandler flushes after every record, so each log line costs a syscall.
+    Here a batch is written when the buffer is full, when a WARNING or worse
+    arrives, when flush_interval has passed since the last write, and on close.
+    """
+
+    def __init__(self, target: logging.FileHandler, capacity: int = 256,
+                 flush_interval: float = 1.0):
+        super().__init__(capacity, flushLevel=logging.WARNING, target=target)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def shouldFlush(self, record):
+        return (super().shouldFlush(record)
+                or time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer and self.target:
+                target = self.target
+                try:
+                    text = ''.join(target.format(r) + target.terminator for r in self.buffer)
+                    target.stream.write(text)
+                    target.stream.flush()
+                except Exception:
+                    target.handleError(self.buffer[-1])
+                self.buffer.clear()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+
 def setup_logging():
     """
     Configure logging to both console and run.log file.
     Aggregates all runs into run.log file.
+
+    Logging threads only enqueue records; a listener thread formats them and
+    does the file and console writes, so disk or terminal stalls never block
+    the vision or dashboard threads.
     """
     log_file = 'run.log'
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -67,19 +112,28 @@ def setup_logging():
     # Create formatter
     formatter = logging.Formatter(log_format, datefmt=date_format)
 
-    # File handler - append mode to aggregate all runs
+    # File handler - append mode to aggregate all runs; records are written
+    # in batches (see BatchedFileHandler)
     file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
+    batched_file_handler = BatchedFileHandler(file_handler)
+    batched_file_handler.setLevel(logging.INFO)
 
     # Console handler - for terminal output
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
 
-    # Add handlers to root logger
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    # Route records through a queue to a listener that owns both handlers
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, batched_file_handler, console_handler, respect_handler_level=True
+    )
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # the handlers add the rest
+    root_logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)  # flushes queued records on exit
 
     # Log session start
     logger = logging.getLogger(__name__)
@@ -117,6 +171,8 @@ class TouchpadReader:
     EV_KEY = 1
     EV_SIZE = 24     # 64-bit: tv_sec(8) + tv_usec(8) + type(2) + code(2) + value(4)
     EV_FMT = 'qqHHi'
+    # Pipe message for each BTN_LEFT value (1 = click down, 0 = up), encoded once
+    MESSAGES = {1: b'TOUCHPAD\npress\n\n', 0: b'TOUCHPAD\nrelease\n\n'}
 
     def __init__(self, pipe_path: str = '/tmp/my_pipe'):
         self.pipe_path = pipe_path
@@ -164,9 +220,8 @@ class TouchpadReader:
                 if len(data) < self.EV_SIZE:
                     break
                 _, _, typ, code, val = struct.unpack(self.EV_FMT, data)
-                if typ == self.EV_KEY and code == self.BTN_LEFT and val in (0, 1):
-                    action = 'press' if val == 1 else 'release'
-                    msg = f'TOUCHPAD\n{action}\n\n'.encode()
+                if typ == self.EV_KEY and code == self.BTN_LEFT and val in self.MESSAGES:
+                    msg = self.MESSAGES[val]
                     try:
                         os.write(pipe_fd, msg)
                     except OSError:
@@ -185,12 +240,42 @@ class TouchpadReader:
         _log.info("TouchpadReader stopped")
 
 
+# Hardware Producer stdout/stderr for this session (restarts append)
+PRODUCER_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run.producer.log')
+
+
+@dataclass
+class ComponentHealth:
+    """Restart bookkeeping for one component supervised by monitor_components()."""
+    name: str
+    is_down: Callable[[], bool]
+    restart: Callable[[], None]
+    # Logs the failure; defaults to "<name> thread has died!"
+    on_down: Optional[Callable[[], None]] = None
+    max_restarts: int = 3
+    restart_count: int = 0
+
+
 class PlayAbleOrchestrator:
     """Main orchestrator for the PlayAble rehabilitation gaming system."""
 
-    def __init__(self, pipe_path: str = '/tmp/my_pipe', camera_index: int = 0):
+    # Re-check interval while something can't be watched by fd (no pidfd
+    # support, or a component is down and waiting for its next restart)
+    MONITOR_INTERVAL_S = 5
+    # How long a component thread gets to report ready at startup
+    READY_TIMEOUT_S = 10
+    # CPU sets used with pin_cpus=True (Pi 5: cores 0-3). MediaPipe's own
+    # inference threads are created before pinning and stay unpinned.
+    VISION_CPUS = frozenset({0, 1})
+    PRODUCER_CPUS = frozenset({0, 1})
+    DASHBOARD_CPUS = frozenset({2})
+    MONITOR_CPUS = frozenset({3})
+
+    def __init__(self, pipe_path: str = '/tmp/my_pipe', camera_index: int = 0,
+                 pin_cpus: bool = False):
         self.pipe_path = pipe_path
         self.camera_index = camera_index
+        self.pin_cpus = pin_cpus
 
         # Component references
         self.hardware_producer_process: Optional[subprocess.Popen] = None
@@ -200,25 +285,63 @@ class PlayAbleOrchestrator:
         self.web_dashboard_thread: Optional[threading.Thread] = None
         self.wifi_manager: Optional[WiFiManager] = None
 
+        # Supervised components, checked in this order by monitor_components()
+        self.components = [
+            ComponentHealth(
+                'Hardware Producer',
+                is_down=lambda: bool(self.hardware_producer_process
+                                     and self.hardware_producer_process.poll() is not None),
+                restart=self.start_hardware_producer,
+                on_down=self._report_producer_crash,
+            ),
+            ComponentHealth(
+                'Vision Sensor',
+                is_down=lambda: bool(self.vision_sensor_thread
+                                     and not self.vision_sensor_thread.is_alive()),
+                restart=self.start_vision_sensor,
+            ),
+            ComponentHealth(
+                'Web Dashboard',
+                is_down=lambda: bool(self.web_dashboard_thread
+                                     and not self.web_dashboard_thread.is_alive()),
+                restart=self.start_web_dashboard,
+            ),
+        ]
+
         # Shared state objects
         self.gesture_detector: Optional[GestureDetector] = None
         self.gesture_mapping: Optional[GestureMapping] = None
 
+        # GestureDetector built in the background while the network check and
+        # producer start run (see _start_detector_build)
+        self._detector_build_thread: Optional[threading.Thread] = None
+        self._detector_build_result = None
+
         # Running state
         self.running = False
 
-        # Register signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # monitor_components() sleeps in select() until the producer exits
+        # (pidfd), a component thread exits, stop() is called (wakeup pipe)
+        # or SIGINT/SIGTERM arrives (signal pipe)
+        self._monitor_selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        self._monitor_selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._producer_pidfd: Optional[int] = None
+        self._producer_log_started = False
+        # Producer process whose exit has already been logged; the monitor
+        # keeps seeing it as down once its restarts are used up
+        self._reported_producer: Optional[subprocess.Popen] = None
+
+        # Until start() finishes, SIGINT/SIGTERM raise KeyboardInterrupt so
+        # they can cut the startup short (run() cleans up); afterwards they go
+        # to the monitor loop through the signal pipe (_route_signals_to_monitor)
+        self._signal_r, self._signal_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        self._monitor_selector.register(self._signal_r, selectors.EVENT_READ, data='signal')
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
 
         logger.info("PlayAble Orchestrator initialized")
 
-    def _signal_handler(self, signum, frame):
-        """Handle shutdown signals gracefully."""
-        signal_name = 'SIGINT' if signum == signal.SIGINT else 'SIGTERM'
-        logger.info(f"Received {signal_name}, initiating graceful shutdown...")
-        self.stop()
-
     def check_and_configure_network(self):
         """
         Check WiFi connectivity.  If WiFi is not available within 20s, start the
@@ -236,16 +359,19 @@ class PlayAbleOrchestrator:
     def create_named_pipe(self):
         """Create Named Pipe if it doesn't exist."""
         try:
-            if os.path.exists(self.pipe_path):
-                if not os.stat(self.pipe_path).st_mode & 0o010000:
-                    logger.warning(f"{self.pipe_path} exists but is not a FIFO, removing...")
-                    os.remove(self.pipe_path)
-                    os.mkfifo(self.pipe_path)
-                else:
-                    logger.info(f"Named Pipe already exists: {self.pipe_path}")
-            else:
+            try:
+                st = os.stat(self.pipe_path)
+            except FileNotFoundError:
+                st = None
+            if st is None:
                 logger.info(f"Creating Named Pipe: {self.pipe_path}")
                 os.mkfifo(self.pipe_path)
+            elif not stat.S_ISFIFO(st.st_mode):
+                logger.warning(f"{self.pipe_path} exists but is not a FIFO, removing...")
+                os.remove(self.pipe_path)
+                os.mkfifo(self.pipe_path)
+            else:
+                logger.info(f"Named Pipe already exists: {self.pipe_path}")
             os.chmod(self.pipe_path, 0o666)
             logger.info(f"Named Pipe ready: {self.pipe_path}")
         except Exception as e:
@@ -257,27 +383,38 @@ class PlayAbleOrchestrator:
         try:
             hardware_producer_path = './controller/build/detect_controller'
 
-            if not os.path.exists(hardware_producer_path):
+            try:
+                st = os.stat(hardware_producer_path)
+            except FileNotFoundError:
                 logger.error(f"Hardware Producer binary not found: {hardware_producer_path}")
                 raise FileNotFoundError(f"Hardware Producer binary not found: {hardware_producer_path}")
 
-            if not os.access(hardware_producer_path, os.X_OK):
+            if not st.st_mode & stat.S_IXUSR:
                 logger.info("Attempting to make binary executable...")
                 os.chmod(hardware_producer_path, 0o755)
 
             logger.info("Starting Hardware Producer subprocess...")
-            self.hardware_producer_process = subprocess.Popen(
-                [hardware_producer_path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                text=True
-            )
+            # No pipes and no preexec_fn: CPython (3.10+) spawns this with
+            # vfork, so the child doesn't copy the page tables of a process
+            # that already has MediaPipe and OpenCV loaded. Output goes
+            # straight to a file, so the producer never blocks on a full pipe.
+            mode = 'ab' if self._producer_log_started else 'wb'
+            with open(PRODUCER_LOG, mode, buffering=0) as producer_log:
+                self.hardware_producer_process = subprocess.Popen(
+                    [hardware_producer_path],
+                    stdout=producer_log,
+                    stderr=subprocess.STDOUT
+                )
+            self._producer_log_started = True
             logger.info(f"Hardware Producer started (PID: {self.hardware_producer_process.pid})")
+            self._watch_producer()
+            self._pin(self.hardware_producer_process.pid, self.PRODUCER_CPUS, "Hardware Producer")
             time.sleep(1)
 
             if self.hardware_producer_process.poll() is not None:
-                stdout, stderr = self.hardware_producer_process.communicate()
-                logger.error("Hardware Producer terminated immediately")
+                logger.error(f"Hardware Producer terminated immediately "
+                             f"(exit code {self.hardware_producer_process.returncode})")
+                self._log_producer_output()
                 raise RuntimeError("Hardware Producer failed to start.")
 
             logger.info("Hardware Producer running successfully")
@@ -287,13 +424,104 @@ class PlayAbleOrchestrator:
             logger.error(f"Failed to start Hardware Producer: {e}", exc_info=True)
             raise
 
+    def _log_producer_output(self, max_bytes: int = 2048):
+        """Log the end of the producer's output file after it has exited."""
+        try:
+            with open(PRODUCER_LOG, 'rb') as f:
+                f.seek(max(0, os.fstat(f.fileno()).st_size - max_bytes))
+                tail = f.read().decode('utf-8', errors='replace').strip()
+        except OSError:
+            return
+        if tail:
+            logger.error(f"Hardware Producer output (end of {PRODUCER_LOG}):\n{tail}")
+
+    def _watch_producer(self):
+        """Register a pidfd for the producer so the monitor wakes when it exits."""
+        self._unwatch_producer()
+        if not hasattr(os, 'pidfd_open'):
+            return
+        try:
+            self._producer_pidfd = os.pidfd_open(self.hardware_producer_process.pid)
+        except OSError as e:
+            logger.info(f"pidfd_open unavailable, polling Hardware Producer instead: {e}")
+            return
+        self._monitor_selector.register(self._producer_pidfd, selectors.EVENT_READ)
+
+    def _unwatch_producer(self):
+        """Drop the producer's pidfd (it stays readable once the process has exited)."""
+        if self._producer_pidfd is None:
+            return
+        self._monitor_selector.unregister(self._producer_pidfd)
+        os.close(self._producer_pidfd)
+        self._producer_pidfd = None
+
+    def _pin(self, pid: int, cpus, name: str):
+        """
+        Restrict a process (or, with pid 0, the calling thread) to a CPU set
+        when pin_cpus is enabled. Best effort: failures are logged and ignored.
+        """
+        if not self.pin_cpus or not hasattr(os, 'sched_setaffinity'):
+            return
+        try:
+            os.sched_setaffinity(pid, cpus)
+            logger.info(f"{name} pinned to CPUs {sorted(cpus)}")
+        except OSError as e:
+            logger.info(f"Could not pin {name} to CPUs {sorted(cpus)}: {e}")
+
+    def _route_signals_to_monitor(self):
+        """
+        Hand SIGINT/SIGTERM to monitor_components() instead of raising.
+
+        The C-level handler writes each signal number to the signal pipe and
+        the monitor calls stop() from ordinary code. A Python handler must
+        still be installed for the write to happen, so a no-op one is.
+        """
+        signal.set_wakeup_fd(self._signal_w)
+        signal.signal(signal.SIGINT, lambda signum, frame: None)
+        signal.signal(signal.SIGTERM, lambda signum, frame: None)
+
+    def _wake_monitor(self):
+        """Wake monitor_components() so it re-checks components right away."""
+        try:
+            os.write(self._wakeup_w, b'\0')
+        except OSError:
+            pass  # pipe full: a wakeup is already pending
+
+    def _start_detector_build(self):
+        """
+        Start building the GestureDetector (camera open, Pose model load) on a
+        background thread, so its seconds of startup overlap the network wait
+        and producer start. initialize_shared_state() collects the result.
+        """
+        def build():
+            try:
+                self._detector_build_result = GestureDetector(camera_index=self.camera_index)
+            except Exception as e:
+                self._detector_build_result = e
+
+        self._detector_build_thread = threading.Thread(
+            target=build, name='GestureDetectorInit', daemon=True
+        )
+        self._detector_build_thread.start()
+
+    def _take_built_detector(self) -> GestureDetector:
+        """Wait for the background build, or build now if none was started."""
+        if self._detector_build_thread is None:
+            return GestureDetector(camera_index=self.camera_index)
+        self._detector_build_thread.join()
+        result, self._detector_build_result = self._detector_build_result, None
+        self._detector_build_thread = None
+        if isinstance(result, Exception):
+            raise result
+        return result
+
     def initialize_shared_state(self):
         """Initialize shared state objects for gesture detection and mapping."""
         try:
             logger.info("Initializing shared state objects...")
             logger.info("Creating GestureDetector...")
             try:
-                self.gesture_detector = GestureDetector(camera_index=self.camera_index)
+                self.gesture_detector = self._take_built_detector()
             except RuntimeError as camera_error:
                 logger.error(f"Camera initialization failed: {camera_error}")
                 raise
@@ -329,46 +557,65 @@ class PlayAbleOrchestrator:
                 daemon=True
             )
             self.vision_sensor_thread.start()
-            time.sleep(1)
-            if not self.vision_sensor_thread.is_alive():
-                raise RuntimeError("Vision Sensor thread failed to start")
+            self._wait_ready(self.vision_sensor.ready, self.vision_sensor_thread, "Vision Sensor")
             logger.info("Vision Sensor thread started")
         except Exception as e:
             logger.error(f"Failed to start Vision Sensor: {e}", exc_info=True)
             raise
 
+    def _wait_ready(self, ready: threading.Event, thread: threading.Thread, name: str):
+        """
+        Wait for a component thread to report that it is up.
+
+        Raises:
+            RuntimeError: If the thread exits first or doesn't report in time
+        """
+        deadline = time.monotonic() + self.READY_TIMEOUT_S
+        while not ready.wait(timeout=0.05):
+            if not thread.is_alive():
+                raise RuntimeError(f"{name} thread failed to start")
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"{name} did not become ready within {self.READY_TIMEOUT_S}s")
+
     def _vision_sensor_wrapper(self):
+        # Threads inherit affinity, so the sensor's detector thread follows
+        self._pin(0, self.VISION_CPUS, "Vision Sensor")
         try:
             self.vision_sensor.run()
         except Exception as e:
             logger.error(f"Vision Sensor thread exception: {e}", exc_info=True)
+        finally:
+            self._wake_monitor()
 
     def start_web_dashboard(self):
         """Start Web Dashboard in dedicated thread."""
         try:
             logger.info("Starting Web Dashboard thread...")
             init_app(self.gesture_detector, self.gesture_mapping, self.wifi_manager)
+            web_ready = threading.Event()
             self.web_dashboard_thread = threading.Thread(
                 target=self._web_dashboard_wrapper,
-                kwargs={'host': '0.0.0.0', 'port': 5000},
+                kwargs={'host': '0.0.0.0', 'port': 5000, 'ready': web_ready},
                 name='WebDashboardThread',
                 daemon=True
             )
             self.web_dashboard_thread.start()
-            time.sleep(1)
-            if not self.web_dashboard_thread.is_alive():
-                raise RuntimeError("Web Dashboard thread failed to start")
+            self._wait_ready(web_ready, self.web_dashboard_thread, "Web Dashboard")
             logger.info("Web Dashboard thread started")
             logger.info("Dashboard available at: http://localhost:5000")
         except Exception as e:
             logger.error(f"Failed to start Web Dashboard: {e}", exc_info=True)
             raise
 
-    def _web_dashboard_wrapper(self, host='0.0.0.0', port=5000):
+    def _web_dashboard_wrapper(self, host='0.0.0.0', port=5000, ready=None):
+        # Request threads started by the server inherit this
+        self._pin(0, self.DASHBOARD_CPUS, "Web Dashboard")
         try:
-            run_server(host=host, port=port)
+            run_server(host=host, port=port, ready=ready)
         except Exception as e:
             logger.error(f"Web Dashboard thread exception: {e}", exc_info=True)
+        finally:
+            self._wake_monitor()
 
     def start(self):
         """Start all system components in the correct order."""
@@ -377,6 +624,7 @@ class PlayAbleOrchestrator:
             logger.info("Starting PlayAble Rehabilitation Gaming System")
             logger.info("=" * 60)
 
+            self._start_detector_build()
             generate_qr_png()
             self.check_and_configure_network()
 
@@ -397,6 +645,7 @@ class PlayAbleOrchestrator:
             logger.info("\n[5/5] Starting Web Dashboard...")
             self.start_web_dashboard()
 
+            self._route_signals_to_monitor()
             self.running = True
 
             logger.info("\n" + "=" * 60)
@@ -418,74 +667,94 @@ class PlayAbleOrchestrator:
             self.cleanup()
             raise
 
+    def _report_producer_crash(self):
+        """Log a Hardware Producer exit and stop watching its pidfd, once per process."""
+        if self.hardware_producer_process is self._reported_producer:
+            return
+        self._reported_producer = self.hardware_producer_process
+        self._unwatch_producer()
+        logger.error(f"Hardware Producer has crashed! "
+                     f"(exit code {self.hardware_producer_process.returncode})")
+        self._log_producer_output()
+
     def monitor_components(self):
         """Monitor component health and restart if necessary."""
-        hardware_producer_restart_count = 0
-        max_hardware_producer_restarts = 3
-        vision_sensor_restart_count = 0
-        max_vision_sensor_restarts = 3
-        web_dashboard_restart_count = 0
-        max_web_dashboard_restarts = 3
+        # Pinned only now: threads started earlier from here (the detector
+        # build and MediaPipe's workers) must keep every core
+        self._pin(0, self.MONITOR_CPUS, "Component monitor")
 
         while self.running:
             try:
-                if self.hardware_producer_process:
-                    if self.hardware_producer_process.poll() is not None:
-                        logger.error("Hardware Producer has crashed!")
-                        if hardware_producer_restart_count < max_hardware_producer_restarts:
-                            hardware_producer_restart_count += 1
-                            logger.info(f"Attempting to restart Hardware Producer ({hardware_producer_restart_count}/{max_hardware_producer_restarts})...")
-                            try:
-                                time.sleep(2)
-                                self.start_hardware_producer()
-                                logger.info("Hardware Producer restarted successfully")
-                                hardware_producer_restart_count = 0
-                            except Exception as e:
-                                logger.error(f"Failed to restart Hardware Producer: {e}")
-                        else:
-                            logger.error("Maximum restart attempts reached for Hardware Producer.")
-
-                if self.vision_sensor_thread and not self.vision_sensor_thread.is_alive():
-                    logger.error("Vision Sensor thread has died!")
-                    if vision_sensor_restart_count < max_vision_sensor_restarts:
-                        vision_sensor_restart_count += 1
-                        logger.info(f"Attempting to restart Vision Sensor ({vision_sensor_restart_count}/{max_vision_sensor_restarts})...")
-                        try:
-                            time.sleep(2)
-                            self.start_vision_sensor()
-                            logger.info("Vision Sensor restarted successfully")
-                            vision_sensor_restart_count = 0
-                        except Exception as e:
-                            logger.error(f"Failed to restart Vision Sensor: {e}")
-                    else:
-                        logger.error("Maximum restart attempts reached for Vision Sensor.")
+                # Sleep until something happens; fall back to a periodic
+                # re-check when an exit can't be signalled or a restart is due
+                if self._producer_pidfd is None and self.hardware_producer_process:
+                    timeout = self.MONITOR_INTERVAL_S
+                elif self._components_down():
+                    timeout = self.MONITOR_INTERVAL_S
+                else:
+                    timeout = None
+                for key, _ in self._monitor_selector.select(timeout):
+                    if key.data == 'signal':
+                        for signum in self._drain(self._signal_r):
+                            logger.info(f"Received {signal.Signals(signum).name}, "
+                                        f"initiating graceful shutdown...")
+                            self.stop()
+                    elif key.fd == self._wakeup_r:
+                        self._drain(self._wakeup_r)
+                if not self.running:
+                    break
 
-                if self.web_dashboard_thread and not self.web_dashboard_thread.is_alive():
-                    logger.error("Web Dashboard thread has died!")
-                    if web_dashboard_restart_count < max_web_dashboard_restarts:
-                        web_dashboard_restart_count += 1
-                        logger.info(f"Attempting to restart Web Dashboard ({web_dashboard_restart_count}/{max_web_dashboard_restarts})...")
-                        try:
-                            time.sleep(2)
-                            self.start_web_dashboard()
-                            logger.info("Web Dashboard restarted successfully")
-                            web_dashboard_restart_count = 0
-                        except Exception as e:
-                            logger.error(f"Failed to restart Web Dashboard: {e}")
+                for component in self.components:
+                    if not component.is_down():
+                        continue
+                    if component.on_down:
+                        component.on_down()
                     else:
-                        logger.error("Maximum restart attempts reached for Web Dashboard.")
-
-                time.sleep(5)
+                        logger.error(f"{component.name} thread has died!")
+                    if component.restart_count >= component.max_restarts:
+                        logger.error(f"Maximum restart attempts reached for {component.name}.")
+                        continue
+                    component.restart_count += 1
+                    logger.info(f"Attempting to restart {component.name} "
+                                f"({component.restart_count}/{component.max_restarts})...")
+                    time.sleep(2)
+                    if not self.running:
+                        break  # stopped during the backoff
+                    try:
+                        component.restart()
+                        logger.info(f"{component.name} restarted successfully")
+                        component.restart_count = 0
+                    except Exception as e:
+                        logger.error(f"Failed to restart {component.name}: {e}")
 
             except Exception as e:
                 logger.error(f"Error in component monitoring: {e}", exc_info=True)
-                time.sleep(5)
+                time.sleep(self.MONITOR_INTERVAL_S)
+
+    @staticmethod
+    def _drain(fd: int) -> bytes:
+        """Read everything pending on a non-blocking pipe."""
+        data = b''
+        try:
+            while True:
+                chunk = os.read(fd, 64)
+                if not chunk:
+                    break
+                data += chunk
+        except BlockingIOError:
+            pass
+        return data
+
+    def _components_down(self) -> bool:
+        """True if any started component is currently not running."""
+        return any(component.is_down() for component in self.components)
 
     def stop(self):
         if not self.running:
             return
         logger.info("\nStopping PlayAble system...")
         self.running = False
+        self._wake_monitor()
         self.cleanup()
 
     def cleanup(self):
@@ -536,6 +805,14 @@ class PlayAbleOrchestrator:
             logger.info("Waiting for Web Dashboard to stop...")
             self.web_dashboard_thread.join(timeout=cleanup_timeout)
 
+        # Startup failed before the background-built detector was taken
+        if self._detector_build_thread is not None:
+            try:
+                built = self._take_built_detector()
+                self.gesture_detector = self.gesture_detector or built
+            except Exception:
+                pass  # the build failed; nothing to release
+
         # Clean up gesture detector
         if self.gesture_detector:
             try:
@@ -555,7 +832,10 @@ class PlayAbleOrchestrator:
             self.start()
             self.monitor_components()
         except KeyboardInterrupt:
-            logger.info("\nReceived keyboard interrupt")
+            # Only raised during start(); later signals go to the monitor loop
+            logger.info("\nShutdown requested during startup")
+            if not self.running:
+                self.cleanup()  # stop() below only cleans up a started system
         except Exception as e:
             logger.error(f"Fatal error: {e}", exc_info=True)
         finally:
@@ -569,12 +849,15 @@ def main():
     parser = argparse.ArgumentParser(description='PlayAble Rehabilitation Gaming System')
     parser.add_argument('--pipe', default='/tmp/my_pipe', help='Path to Named Pipe')
     parser.add_argument('--camera', type=int, default=0, help='Camera device index')
+    parser.add_argument('--pin-cpus', action='store_true',
+                        help='Pin the vision, dashboard, monitor and producer to separate CPU cores')
     parser.add_argument('--version', action='version', version='PlayAble v1.0.0')
     args = parser.parse_args()
 
     orchestrator = PlayAbleOrchestrator(
         pipe_path=args.pipe,
-        camera_index=args.camera
+        camera_index=args.camera,
+        pin_cpus=args.pin_cpus
     )
     orchestrator.run()
 
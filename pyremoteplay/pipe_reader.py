@@ -1,12 +1,65 @@
 """Pipe Reader for consuming Named Pipe messages and forwarding to Controller."""
 import logging
 import os
+import select
 import threading
 import time
 from typing import Optional
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bytes requested per read(); one read usually returns every queued message
+READ_CHUNK = 65536
+
+_VALID_BUTTONS = frozenset((
+    'UP', 'DOWN', 'LEFT', 'RIGHT',
+    'CROSS', 'CIRCLE', 'SQUARE', 'TRIANGLE',
+    'L1', 'R1', 'L2', 'R2', 'L3', 'R3',
+    'OPTIONS', 'PS', 'SHARE', 'TOUCHPAD'
+))
+_ACTIONS = frozenset(('press', 'release'))
+_AXES = frozenset(('x', 'y'))
+_STICKS = frozenset(('LEFT', 'RIGHT'))
+
+# Tag in element 0 of a parsed message:
+#   (_BUTTON, button, action) or (_ANALOG, stick, axis, value)
+_BUTTON, _ANALOG = 0, 1
+
+
+def _parse_button(line1: str, line2: str, line3: str) -> Optional[tuple]:
+    """Validate a button message (line2 is press/release)."""
+    if line1 not in _VALID_BUTTONS:
+        _LOGGER.warning(f"Invalid button name: {line1}")
+        return None
+    
+    return (_BUTTON, line1, line2)
+
+
+def _parse_analog(line1: str, line2: str, line3: str) -> Optional[tuple]:
+    """Validate an analog message (line2 is x/y) and clamp its value."""
+    if line1 not in _STICKS:
+        _LOGGER.warning(f"Invalid stick name: {line1}")
+        return None
+    
+    try:
+        value = float(line3)
+    except ValueError:
+        _LOGGER.warning(f"Invalid analog value: {line3}")
+        return None
+    # Validate value range (-1.0 to 1.0)
+    if not (-1.0 <= value <= 1.0):
+        _LOGGER.warning(f"Analog value out of range: {value}")
+        value = max(-1.0, min(1.0, value))  # Clamp to valid range
+    
+    return (_ANALOG, line1, line2, value)
+
+
+# Message type is determined by line2
+_PARSERS = {
+    **dict.fromkeys(_ACTIONS, _parse_button),
+    **dict.fromkeys(_AXES, _parse_analog),
+}
+
 
 class PipeReader:
     """Reads from Named Pipe and forwards commands to Controller."""
@@ -22,6 +75,10 @@ class PipeReader:
         self.pipe_path = pipe_path
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        # eventfd that stop() signals to wake the reader out of epoll
+        self._wake_fd: Optional[int] = None
+        # Bytes read from the pipe but not yet parsed (a partial message)
+        self._buf = bytearray()
         _LOGGER.info(f"PipeReader initialized with pipe: {pipe_path}")
 
     def start(self):
@@ -31,6 +88,8 @@ class PipeReader:
             return
         
         self.running = True
+        if self._wake_fd is None:
+            self._wake_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
         self.thread = threading.Thread(target=self._read_loop, daemon=True)
         self.thread.start()
         _LOGGER.info("PipeReader thread started")
@@ -42,66 +101,135 @@ class PipeReader:
         
         _LOGGER.info("Stopping PipeReader...")
         self.running = False
+        os.eventfd_write(self._wake_fd, 1)
         
         if self.thread:
             self.thread.join(timeout=2)
             if self.thread.is_alive():
                 _LOGGER.warning("PipeReader thread did not stop gracefully")
+                self._wake_fd = None  # Still in the thread's epoll set; left open
             else:
                 _LOGGER.info("PipeReader thread stopped")
             self.thread = None
+        if self._wake_fd is not None:
+            os.close(self._wake_fd)
+            self._wake_fd = None
 
     def _read_loop(self):
         """Continuously read from pipe and forward messages to controller with error recovery."""
         _LOGGER.info("PipeReader loop started")
         consecutive_errors = 0
         max_consecutive_errors = 10
+        # The pipe and the stop() eventfd share one epoll set, so the thread
+        # sleeps in the kernel until data arrives or it is told to stop
+        epoll = select.epoll()
+        epoll.register(self._wake_fd, select.EPOLLIN)
         
-        while self.running:
-            try:
-                # Open pipe for reading (blocks until writer opens)
-                with open(self.pipe_path, 'r') as pipe:
-                    _LOGGER.info("Pipe opened for reading")
-                    consecutive_errors = 0  # Reset error counter on successful open
-                    
-                    while self.running:
-                        try:
-                            message = self._parse_message(pipe)
-                            if message:
-                                self._forward_to_controller(message)
-                                consecutive_errors = 0  # Reset on successful message
-                        except Exception as msg_error:
-                            consecutive_errors += 1
-                            _LOGGER.error(f"Message processing error: {msg_error}")
-                            
+        try:
+            while self.running:
+                try:
+                    # A non-blocking open returns at once even without a
+                    # writer; the pipe turns readable when one sends data
+                    fd = os.open(self.pipe_path, os.O_RDONLY | os.O_NONBLOCK)
+                    try:
+                        epoll.register(fd, select.EPOLLIN)
+                        _LOGGER.info("Pipe opened for reading")
+                        consecutive_errors = 0  # Reset error counter on successful open
+                        self._buf.clear()
+
+                        while self.running:
+                            events = epoll.poll()
+                            if any(ready == self._wake_fd for ready, _ in events):
+                                break  # stop() was called
+                            try:
+                                # One read returns every message queued since the last one
+                                data = os.read(fd, READ_CHUNK)
+                            except BlockingIOError:
+                                continue
+                            if not data:
+                                _LOGGER.info("All pipe writers disconnected, reopening pipe...")
+                                break
+                            self._buf += data
+
+                            for lines in self._drain_messages():
+                                try:
+                                    message = self._parse_message(*lines)
+                                    if message:
+                                        self._forward_to_controller(message)
+                                        consecutive_errors = 0  # Reset on successful message
+                                except Exception as msg_error:
+                                    consecutive_errors += 1
+                                    _LOGGER.error(f"Message processing error: {msg_error}")
+
+                                    if consecutive_errors >= max_consecutive_errors:
+                                        break
+
+                                    time.sleep(0.1)  # Brief delay before next message
+
                             if consecutive_errors >= max_consecutive_errors:
                                 _LOGGER.error(
                                     f"Too many consecutive errors ({consecutive_errors}), "
                                     "reopening pipe..."
                                 )
                                 break  # Break inner loop to reopen pipe
-                            
-                            time.sleep(0.1)  # Brief delay before next message
-                        
-            except FileNotFoundError:
-                _LOGGER.error(f"Pipe not found: {self.pipe_path}")
-                _LOGGER.info("Waiting for pipe to be created...")
-                time.sleep(2)  # Wait before retry
-            except BrokenPipeError:
-                _LOGGER.warning("Pipe broken - writer may have disconnected")
-                _LOGGER.info("Attempting to reopen pipe...")
-                time.sleep(1)  # Wait before retry
-            except IOError as io_error:
-                _LOGGER.error(f"IO error reading from pipe: {io_error}")
-                _LOGGER.info("Attempting to reopen pipe...")
-                time.sleep(1)  # Wait before retry
-            except Exception as error:
-                _LOGGER.error(f"Pipe read error: {error}", exc_info=True)
-                time.sleep(1)  # Wait before retry
+                    finally:
+                        os.close(fd)  # Also drops it from the epoll set
+
+                except FileNotFoundError:
+                    _LOGGER.error(f"Pipe not found: {self.pipe_path}")
+                    _LOGGER.info("Waiting for pipe to be created...")
+                    epoll.poll(2)  # Wait before retry; returns early on stop()
+                except BrokenPipeError:
+                    _LOGGER.warning("Pipe broken - writer may have disconnected")
+                    _LOGGER.info("Attempting to reopen pipe...")
+                    epoll.poll(1)  # Wait before retry
+                except IOError as io_error:
+                    _LOGGER.error(f"IO error reading from pipe: {io_error}")
+                    _LOGGER.info("Attempting to reopen pipe...")
+                    epoll.poll(1)  # Wait before retry
+                except Exception as error:
+                    _LOGGER.error(f"Pipe read error: {error}", exc_info=True)
+                    epoll.poll(1)  # Wait before retry
+        finally:
+            epoll.close()
         
         _LOGGER.info("PipeReader loop ended")
 
-    def _parse_message(self, pipe) -> Optional[dict]:
+    def _drain_messages(self):
+        """Pop complete messages from the read buffer.
+
+        A trailing partial message stays in the buffer for the next read.
+        Consumed bytes are removed in one step once the generator finishes.
+
+        Yields:
+            (line1, line2, line3) of each message, decoded and stripped
+        """
+        buf = self._buf
+        pos = 0
+        try:
+            while True:
+                end1 = buf.find(b'\n', pos)
+                if end1 < 0:
+                    break
+                if not buf[pos:end1].strip():
+                    pos = end1 + 1  # Skip a stray blank line
+                    continue
+                end2 = buf.find(b'\n', end1 + 1)
+                if end2 < 0:
+                    break
+                end3 = buf.find(b'\n', end2 + 1)
+                if end3 < 0:
+                    break
+                lines = tuple(
+                    buf[start:end].strip().decode('utf-8', 'replace')
+                    for start, end in ((pos, end1), (end1 + 1, end2), (end2 + 1, end3))
+                )
+                pos = end3 + 1
+                yield lines
+        finally:
+            del buf[:pos]
+
+    def _parse_message(self, line1: str, line2: str, line3: str) -> Optional[tuple]:
         """Parse pipe message into structured data with validation.
         
         Protocol:
@@ -109,107 +237,51 @@ class PipeReader:
         - Analog message: LEFT|RIGHT\nx|y\nfloat_value\n
         
         Args:
-            pipe: Open file handle to the pipe
+            line1: Button name or stick name
+            line2: Action or axis
+            line3: Empty for buttons, value for analog
             
         Returns:
-            Dictionary with message data or None if parsing fails
+            (_BUTTON, button, action), (_ANALOG, stick, axis, value),
+            or None if parsing fails
         """
         try:
-            # Read first line (button name or stick name)
-            line1 = pipe.readline().strip()
-            if not line1:
-                return None
-            
-            # Read second line (action or axis)
-            line2 = pipe.readline().strip()
             if not line2:
                 _LOGGER.warning("Incomplete message: missing line 2")
                 return None
             
-            # Read third line (empty for buttons, value for analog)
-            line3 = pipe.readline().strip()
-            
-            # Determine message type based on line2
-            if line2 in ['press', 'release']:
-                # Button message - validate button name
-                valid_buttons = [
-                    'UP', 'DOWN', 'LEFT', 'RIGHT',
-                    'CROSS', 'CIRCLE', 'SQUARE', 'TRIANGLE',
-                    'L1', 'R1', 'L2', 'R2', 'L3', 'R3',
-                    'OPTIONS', 'PS', 'SHARE', 'TOUCHPAD'
-                ]
-                
-                if line1 not in valid_buttons:
-                    _LOGGER.warning(f"Invalid button name: {line1}")
-                    return None
-                
-                return {
-                    'type': 'button',
-                    'button': line1,
-                    'action': line2
-                }
-            elif line2 in ['x', 'y']:
-                # Analog message - validate stick name and value
-                if line1 not in ['LEFT', 'RIGHT']:
-                    _LOGGER.warning(f"Invalid stick name: {line1}")
-                    return None
-                
-                try:
-                    value = float(line3)
-                    # Validate value range (-1.0 to 1.0)
-                    if not (-1.0 <= value <= 1.0):
-                        _LOGGER.warning(f"Analog value out of range: {value}")
-                        value = max(-1.0, min(1.0, value))  # Clamp to valid range
-                    
-                    return {
-                        'type': 'analog',
-                        'stick': line1,
-                        'axis': line2,
-                        'value': value
-                    }
-                except ValueError:
-                    _LOGGER.warning(f"Invalid analog value: {line3}")
-                    return None
-            else:
+            parser = _PARSERS.get(line2)
+            if parser is None:
                 _LOGGER.warning(f"Unknown message format. Line2: {line2}")
                 return None
+            return parser(line1, line2, line3)
                 
-        except EOFError:
-            _LOGGER.debug("End of pipe reached")
-            return None
         except Exception as error:
             _LOGGER.error(f"Parse error: {error}", exc_info=True)
             return None
 
-    def _forward_to_controller(self, message: dict):
+    def _forward_to_controller(self, message: tuple):
         """Send command to PS5 via Controller with error handling.
         
         Args:
-            message: Parsed message dictionary
+            message: Parsed message tuple (see _parse_message)
         """
         max_retries = 3
         
         for attempt in range(max_retries):
             try:
-                if message['type'] == 'button':
-                    self.controller.button(
-                        message['button'],
-                        message['action']
-                    )
-                    _LOGGER.debug(f"Button: {message['button']} {message['action']}")
+                if message[0] == _BUTTON:
+                    _, button, action = message
+                    self.controller.button(button, action)
+                    _LOGGER.debug(f"Button: {button} {action}")
                     return  # Success
                     
-                elif message['type'] == 'analog':
-                    self.controller.stick(
-                        message['stick'],
-                        message['axis'],
-                        message['value']
-                    )
+                elif message[0] == _ANALOG:
+                    _, stick, axis, value = message
+                    self.controller.stick(stick, axis, value)
                     # Update sticks to send state to PS5
                     self.controller.update_sticks()
-                    _LOGGER.debug(
-                        f"Stick: {message['stick']} {message['axis']} = {message['value']}"
-                    )
+                    _LOGGER.debug(f"Stick: {stick} {axis} = {value}")
                     return  # Success
                     
             except AttributeError as attr_error:
@@ -21,6 +21,7 @@ from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from flask import Flask, render_template, request, jsonify, Response
 from flask_cors import CORS
+from werkzeug.serving import make_server
 import cv2
 
 # Import core components
@@ -37,6 +38,21 @@ except ImportError:
     WiFiManager = None
     def get_hostname(): return "playable"
 
+try:
+    from waitress.server import create_server  # optional: pooled WSGI server instead of Flask's dev server
+except ImportError:
+    create_server = None
+
+# Worker threads when serving with waitress. Each open /video_feed stream
+# holds one for as long as it is watched; status polls share the rest.
+WEB_SERVER_THREADS = 8
+
+# Open /video_feed streams allowed at once. A stream from a closed or reloaded
+# tab only ends when a write fails, so without a cap a few tabs could take
+# every worker thread and starve /api/status and the config endpoints.
+MAX_VIDEO_STREAMS = 3
+_video_stream_slots = threading.BoundedSemaphore(MAX_VIDEO_STREAMS)
+
 # Configure logging (if not already configured by main)
 if not logging.getLogger().handlers:
     logging.basicConfig(
@@ -569,7 +585,7 @@ def get_status():
             status['fps'] = gesture_detector.get_fps()
 
         if gesture_mapping:
-            status['active_mappings'] = gesture_mapping.get_active_mappings()
+            status['active_mappings'] = dict(gesture_mapping.get_active_mappings())
 
         # Real controller detection — check /proc first (USB), fall back to bluetoothctl (BT)
         try:
@@ -924,7 +940,7 @@ def thresholds():
         try:
             if not gesture_detector:
                 return jsonify({'error': 'Gesture detector not initialized'}), 500
-            return jsonify(gesture_detector.get_thresholds())
+            return jsonify(dict(gesture_detector.get_thresholds()))
         except Exception as e:
             logger.error(f"Get thresholds error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -937,6 +953,7 @@ def thresholds():
             raise_minimum = data.get('raise_minimum')
             shrug_minimum = data.get('shrug_minimum')
             mouth_open_minimum = data.get('mouth_open_minimum')
+            motion_minimum = data.get('motion_minimum')
             if delta_threshold is None or raise_minimum is None:
                 return jsonify({'error': 'delta_threshold and raise_minimum are required'}), 400
             if not (0.01 <= delta_threshold <= 0.20):
@@ -947,14 +964,18 @@ def thresholds():
                 return jsonify({'error': 'shrug_minimum must be between 0.01 and 0.50'}), 400
             if mouth_open_minimum is not None and not (0.10 <= mouth_open_minimum <= 1.0):
                 return jsonify({'error': 'mouth_open_minimum must be between 0.10 and 1.0'}), 400
+            if motion_minimum is not None and not (0.0 <= motion_minimum <= 255.0):
+                return jsonify({'error': 'motion_minimum must be between 0.0 and 255.0'}), 400
             # Update live GestureDetector in memory immediately
             gesture_detector.update_thresholds(delta_threshold, raise_minimum,
-                                                shrug_minimum, mouth_open_minimum)
+                                                shrug_minimum, mouth_open_minimum,
+                                                motion_minimum)
             # Also persist to mappings.json so vision sensor picks up via live reload
             if gesture_mapping:
                 gesture_mapping.update_thresholds(delta_threshold, raise_minimum,
-                                                  shrug_minimum, mouth_open_minimum)
-            updated = gesture_detector.get_thresholds()
+                                                  shrug_minimum, mouth_open_minimum,
+                                                  motion_minimum)
+            updated = dict(gesture_detector.get_thresholds())
             return jsonify({
                 'success': True,
                 'message': 'Thresholds updated',
@@ -973,7 +994,7 @@ def mappings():
         try:
             if not gesture_mapping:
                 return jsonify({'error': 'Gesture mapping not initialized'}), 500
-            return jsonify(gesture_mapping.get_active_mappings())
+            return jsonify(dict(gesture_mapping.get_active_mappings()))
         except Exception as e:
             logger.error(f"Get mappings error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -1016,6 +1037,10 @@ def mappings():
 
 @app.route('/video_feed')
 def video_feed():
+    if not _video_stream_slots.acquire(blocking=False):
+        logger.warning(f"Refusing /video_feed: {MAX_VIDEO_STREAMS} streams already open")
+        return Response('Too many open video streams', status=503, mimetype='text/plain')
+
     def generate_frames():
         consecutive_errors = 0
         max_consecutive_errors = 10
@@ -1084,16 +1109,38 @@ def video_feed():
                 if consecutive_errors >= max_consecutive_errors:
                     break
 
-    return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    response = Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    # Runs when the server closes the response, even if it never started iterating
+    response.call_on_close(_video_stream_slots.release)
+    return response
+
 
+def run_server(host='0.0.0.0', port=5000, ready: Optional[threading.Event] = None):
+    """
+    Serve the dashboard until the process exits.
 
-def run_server(host='0.0.0.0', port=5000):
+    Args:
+        host: Interface to bind
+        port: First port to try; the next few are tried if it is taken
+        ready: Set once the listening socket is bound and requests can be served
+    """
     max_port_attempts = 5
     current_port = port
     for attempt in range(max_port_attempts):
         try:
-            logger.info(f"Starting Flask server on {host}:{current_port}")
-            app.run(host=host, port=current_port, debug=False, threaded=True)
+            # Bind first, then report ready, then serve
+            if create_server is not None:
+                logger.info(f"Starting waitress server on {host}:{current_port}")
+                server = create_server(app, host=host, port=current_port,
+                                       threads=WEB_SERVER_THREADS)
+                serve_forever = server.run
+            else:
+                logger.info(f"Starting Flask server on {host}:{current_port}")
+                server = make_server(host, current_port, app, threaded=True)
+                serve_forever = server.serve_forever
+            if ready is not None:
+                ready.set()
+            serve_forever()
             return
         except OSError as e:
             if 'Address already in use' in str(e) or 'Errno 48' in str(e):